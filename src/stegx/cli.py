@@ -7,7 +7,12 @@ import logging
 import os
 import sys
 import time
-import zlib
+try:
+    # Drop-in zlib API with SIMD-accelerated DEFLATE/CRC when the optional
+    # python-zlib-ng package is installed.
+    from zlib_ng import zlib_ng as zlib
+except ImportError:
+    import zlib
 from typing import Callable, List, Optional
 
 from PIL import Image, UnidentifiedImageError
@@ -31,6 +36,7 @@ from stegx.yubikey import (
 from stegx.steganography import (
     EmbedOptions,
     calculate_lsb_capacity,
+    calculate_lsb_capacity_for,
     embed_v2,
     extract_v2,
 )
@@ -469,12 +475,16 @@ def _resolve_encode_panic(
 
 def _probe_cover_capacity(cover_path: str, original_arg: str) -> int:
     try:
+
+        # Image.open only reads the header; capacity needs just size and
+        # mode, so keep the probe lazy and skip the pixel-decoding convert
+        # a palette cover would otherwise trigger (the real embed converts).
         with Image.open(cover_path) as probe:
-            if probe.mode == "P":
-                probe = probe.convert("RGBA")
-            elif probe.mode not in ("RGB", "RGBA", "L"):
+            width, height = probe.size
+            mode = "RGBA" if probe.mode == "P" else probe.mode
+            if mode not in ("RGB", "RGBA", "L"):
                 raise ValueError(f"Unsupported cover image mode: {probe.mode}.")
-            return calculate_lsb_capacity(probe)
+            return calculate_lsb_capacity_for(width, height, mode)
     except UnidentifiedImageError:
         raise ValueError(f"Cannot identify image file: {original_arg}")
 
@@ -3,7 +3,14 @@ from __future__ import annotations
 import bz2
 import logging
 import lzma
-import zlib
+import sys
+try:
+    # Drop-in zlib API with SIMD-accelerated DEFLATE/CRC when the optional
+    # python-zlib-ng package is installed.
+    from zlib_ng import zlib_ng as zlib
+except ImportError:
+    import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Dict, List, Optional, Tuple
 
 from .exceptions import DecompressionBombError
@@ -31,6 +38,10 @@ MODE_BEST = "best"
 VALID_MODES = (MODE_FAST, MODE_BEST)
 
 
+# Below this size, thread startup costs more than the codecs themselves.
+_PARALLEL_MIN_BYTES = 64 * 1024
+
+
 _FIPS_ALLOWED_ALGS = {ALG_NONE, ALG_ZLIB}
 
 def _fips_check_alg(alg_name: str) -> None:
@@ -312,23 +323,44 @@ def compress_best(
                 desc=f"compress {len(data)} B",
                 unit="codec",
                 leave=False,
+                disable=not sys.stderr.isatty(),
             )
         except ImportError:
             bar = None
 
-    candidates: List[Tuple[str, bytes]] = [(ALG_NONE, data)]
-    for alg_name, fn in codec_plan:
-        if bar is not None:
-            bar.set_postfix_str(alg_name, refresh=False)
+    def _try_codec(alg_name: str, fn: "_CompressorFn") -> Optional[bytes]:
         try:
-            blob = fn(data)
+            return fn(data)
         except Exception as e:
             logging.debug("%s compression failed: %s", alg_name, e)
-            blob = None
-        if blob is not None:
-            candidates.append((alg_name, blob))
-        if bar is not None:
-            bar.update(1)
+            return None
+
+    candidates: List[Tuple[str, bytes]] = [(ALG_NONE, data)]
+    if len(codec_plan) > 1 and len(data) >= _PARALLEL_MIN_BYTES:
+
+        # All candidate codecs release the GIL while compressing, so trial
+        # compressions can run concurrently; results are collected in plan
+        # order to keep the winner selection deterministic.
+        with ThreadPoolExecutor(max_workers=len(codec_plan)) as pool:
+            futures = [
+                (alg_name, pool.submit(_try_codec, alg_name, fn))
+                for alg_name, fn in codec_plan
+            ]
+            for alg_name, future in futures:
+                blob = future.result()
+                if blob is not None:
+                    candidates.append((alg_name, blob))
+                if bar is not None:
+                    bar.update(1)
+    else:
+        for alg_name, fn in codec_plan:
+            if bar is not None:
+                bar.set_postfix_str(alg_name, refresh=False)
+            blob = _try_codec(alg_name, fn)
+            if blob is not None:
+                candidates.append((alg_name, blob))
+            if bar is not None:
+                bar.update(1)
     if bar is not None:
         bar.close()
 
@@ -20,6 +20,7 @@ FLAG_YUBIKEY = 1 << 5
 
 KDF_ARGON2ID = 0x02
 KDF_PBKDF2 = 0x01
+KDF_PBKDF2_SHA512 = 0x03
 
 
 HKDF_INFO_AES = b"stegx/v2/aes-256-gcm"
@@ -4,7 +4,12 @@ import logging
 import os
 import struct
 import tempfile
-import zlib
+try:
+    # Drop-in zlib API with SIMD-accelerated DEFLATE/CRC when the optional
+    # python-zlib-ng package is installed.
+    from zlib_ng import zlib_ng as zlib
+except ImportError:
+    import zlib
 from dataclasses import dataclass
 from typing import Optional
 
@@ -35,6 +35,8 @@ from .exceptions import AuthenticationFailure, CorruptedPayload
 from .fips import ban_if_fips
 from .secure_memory import SecureBuffer
 
+_SHA256 = hashes.SHA256()
+
 LEGACY_SALT_SIZE = 16
 LEGACY_NONCE_SIZE = 12
 LEGACY_KEY_SIZE = 32
@@ -183,7 +185,10 @@ def decrypt_data(
     ct_end = ct_start + header.inner_ct_length
     if ct_end > len(encrypted_stream):
         raise CorruptedPayload("Encrypted stream truncated: inner ciphertext length exceeds buffer.")
-    ciphertext = encrypted_stream[ct_start:ct_end]
+
+    # The AEAD primitives accept bytes-like objects, so slice through a
+    # memoryview to avoid copying a potentially large ciphertext.
+    ciphertext = memoryview(encrypted_stream)[ct_start:ct_end]
 
 
     if header.has(FLAG_DUAL_CIPHER):
@@ -266,7 +271,7 @@ def decrypt_legacy_v1(encrypted_payload: bytes, password: str) -> bytes:
 
 def _legacy_derive_key(password: str, salt: bytes) -> bytes:
     kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
+        algorithm=_SHA256,
         length=LEGACY_KEY_SIZE,
         salt=salt,
         iterations=LEGACY_PBKDF2_ITERATIONS,
@@ -2,20 +2,43 @@ from __future__ import annotations
 
 import hashlib
 import random
+from collections import OrderedDict
 from typing import List, Sequence, Tuple
 
-Position = Tuple[int, int, int]
+# Flat channel-slot index into the image buffer; see embedding.Position.
+Position = int
 
-def _region_rng(cover_fingerprint: bytes) -> random.Random:
+# Encode and an immediate verify-extract regenerate the same seeded
+# Mersenne-Twister permutation; cache it keyed on (seed, length) so the
+# second pass is a plain index mapping. The permutation depends only on
+# the seed and the element count, never on the element values.
+_PERM_CACHE: "OrderedDict[Tuple[int, int], List[int]]" = OrderedDict()
+_PERM_CACHE_MAX = 4
+
+def _shuffle_permutation(n: int, seed_int: int) -> List[int]:
+    key = (seed_int, n)
+    cached = _PERM_CACHE.get(key)
+    if cached is not None:
+        _PERM_CACHE.move_to_end(key)
+        return cached
+
+    perm = list(range(n))
+    random.Random(seed_int).shuffle(perm)
+
+    _PERM_CACHE[key] = perm
+    while len(_PERM_CACHE) > _PERM_CACHE_MAX:
+        _PERM_CACHE.popitem(last=False)
+    return perm
+
+def _region_seed(cover_fingerprint: bytes) -> int:
     seed_bytes = hashlib.sha256(b"stegx/v2/decoy-split\x00" + cover_fingerprint).digest()
-    return random.Random(int.from_bytes(seed_bytes[:16], "big"))
+    return int.from_bytes(seed_bytes[:16], "big")
 
 def split_regions(
     all_positions: Sequence[Position],
     cover_fingerprint: bytes,
 ) -> Tuple[List[Position], List[Position]]:
-    indices = list(range(len(all_positions)))
-    _region_rng(cover_fingerprint).shuffle(indices)
+    indices = _shuffle_permutation(len(all_positions), _region_seed(cover_fingerprint))
     half = len(indices) // 2
     decoy_idx = sorted(indices[:half])
     real_idx = sorted(indices[half:])
@@ -24,6 +47,5 @@ def split_regions(
     return decoy_region, real_region
 
 def reorder_region(region: Sequence[Position], seed_int: int) -> List[Position]:
-    region_list = list(region)
-    random.Random(seed_int).shuffle(region_list)
-    return region_list
+    perm = _shuffle_permutation(len(region), seed_int)
+    return [region[i] for i in perm]
@@ -1,79 +1,238 @@
 from __future__ import annotations
 
 import random
+from itertools import islice
 from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from PIL import Image, ImageFilter
 
-Position = Tuple[int, int, int]
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Positions are flat channel-slot indices into the image's raw byte buffer:
+# idx = (y * width + x) * bands + c. One int64 per slot instead of an
+# (x, y, c) tuple keeps a full-image position list an order of magnitude
+# smaller and removes the per-access tuple unpack.
+Position = int
 
 LSB_MATCHING = "lsb_matching"
 LSB_REPLACEMENT = "lsb_replacement"
 MATRIX_HAMMING = "matrix_hamming"
 
-def _get_lsb(pixels, x: int, y: int, c: int, is_gray: bool) -> int:
-    if is_gray:
-        return pixels[x, y] & 1
-    return pixels[x, y][c] & 1
+class FlatPixelBuffer:
+    """Mutable flat view over an image's raw bytes for the no-NumPy fallback.
 
-def _set_lsb_replacement(pixels, x: int, y: int, c: int, is_gray: bool, bit: int) -> None:
-    if is_gray:
-        v = pixels[x, y]
-        pixels[x, y] = (v & ~1) | bit
-        return
-    pixel = list(pixels[x, y])
-    pixel[c] = (pixel[c] & ~1) | bit
-    pixels[x, y] = tuple(pixel)
-
-def _adjust_pm1(pixels, x: int, y: int, c: int, is_gray: bool, rng: random.Random) -> None:
-    if is_gray:
-        v = pixels[x, y]
-        if v == 0:
-            new = 1
-        elif v == 255:
-            new = 254
-        else:
-            new = v + (1 if rng.random() < 0.5 else -1)
-        pixels[x, y] = new
-        return
-    pixel = list(pixels[x, y])
-    v = pixel[c]
+    A ``PixelAccess`` object pays a Python/C boundary hop and a tuple
+    rebuild per pixel; working on one contiguous bytearray from
+    ``Image.tobytes()`` keeps the fallback loops on plain int indexing.
+    """
+
+    __slots__ = ("buf", "width", "channels")
+
+    def __init__(self, buf: bytearray, width: int, channels: int) -> None:
+        self.buf = buf
+        self.width = width
+        self.channels = channels
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> "FlatPixelBuffer":
+        return cls(bytearray(image.tobytes()), image.size[0], len(image.getbands()))
+
+    def write_back(self, image: Image.Image) -> None:
+        image.frombytes(bytes(self.buf))
+
+def _adjust_pm1(buf: bytearray, idx: int, rng: random.Random) -> None:
+    v = buf[idx]
     if v == 0:
-        new = 1
+        buf[idx] = 1
     elif v == 255:
-        new = 254
+        buf[idx] = 254
     else:
-        new = v + (1 if rng.random() < 0.5 else -1)
-    pixel[c] = new
-    pixels[x, y] = tuple(pixel)
+        buf[idx] = v + (1 if rng.random() < 0.5 else -1)
+
+def positions_to_indices(positions: Sequence[Position]):
+    if isinstance(positions, np.ndarray):
+        return positions
+    return np.asarray(positions, dtype=np.int64)
+
+def _bits_to_array(bits):
+    if np is not None and isinstance(bits, np.ndarray):
+        return bits
+    return np.frombuffer(bits.encode("ascii"), dtype=np.uint8) - ord("0")
+
+def _adjust_pm1_flat(flat, indices, rng: random.Random) -> None:
+    if indices.size == 0:
+        return
+    values = flat[indices].astype(np.int16)
+    signs = (np.frombuffer(rng.randbytes(indices.size), dtype=np.uint8) & 1).astype(np.int16) * 2 - 1
+    adjusted = values + signs
+    adjusted[values == 0] = 1
+    adjusted[values == 255] = 254
+    flat[indices] = adjusted.astype(np.uint8)
+
+def embed_bits_flat(
+    flat,
+    indices,
+    bits,
+    method: str,
+    rng: random.Random,
+    use_replacement_for_matrix: bool = False,
+) -> int:
+    if method == MATRIX_HAMMING:
+        return _embed_matrix_hamming_flat(
+            flat, indices, bits, rng, k=3, use_replacement=use_replacement_for_matrix
+        )
+
+    bit_arr = _bits_to_array(bits)
+    if bit_arr.size > indices.size:
+        raise ValueError("Ran out of positions while embedding bits.")
+    target = indices[: bit_arr.size]
+    if method == LSB_REPLACEMENT:
+        flat[target] = (flat[target] & np.uint8(0xFE)) | bit_arr
+    elif method == LSB_MATCHING:
+        mismatched = (flat[target] & 1) != bit_arr
+        _adjust_pm1_flat(flat, target[mismatched], rng)
+    else:
+        raise ValueError(f"Unknown embedding method: {method}")
+    return int(bit_arr.size)
+
+def extract_bits_flat(flat, indices, nbits: int, method: str) -> str:
+    if method == MATRIX_HAMMING:
+        return _extract_matrix_hamming_flat(flat, indices, nbits, k=3)
+    lsbs = (flat[indices[:nbits]] & np.uint8(1)) + np.uint8(ord("0"))
+    return lsbs.tobytes().decode("ascii")
+
+def extract_bytes_flat(flat, indices, nbits: int, method: str) -> bytes:
+    if method == MATRIX_HAMMING:
+        bits = _matrix_hamming_bits_flat(flat, indices, nbits, k=3)
+    else:
+        bits = flat[indices[:nbits]] & np.uint8(1)
+    return np.packbits(bits[: (nbits // 8) * 8]).tobytes()
+
+def _embed_matrix_hamming_flat(
+    flat,
+    indices,
+    bits,
+    rng: random.Random,
+    k: int,
+    use_replacement: bool = False,
+) -> int:
+    bit_arr = _bits_to_array(bits)
+    total_bits = int(bit_arr.size)
+    block_cover = (1 << k) - 1
+    blocks = (total_bits + k - 1) // k
+    if blocks * block_cover > indices.size:
+        raise ValueError("Ran out of positions for matrix-embedding block.")
+    if total_bits % k:
+        bit_arr = np.concatenate(
+            [bit_arr, np.zeros(k - total_bits % k, dtype=np.uint8)]
+        )
+
+    weights = (1 << np.arange(k - 1, -1, -1)).astype(np.uint8)
+    messages = (bit_arr.reshape(-1, k) * weights).sum(axis=1).astype(np.uint8)
+
+    block_indices = indices[: blocks * block_cover].reshape(-1, block_cover)
+    lsbs = flat[block_indices] & 1
+    syndromes = np.zeros(blocks, dtype=np.uint8)
+    for i in range(block_cover):
+        syndromes ^= np.where(lsbs[:, i] == 1, np.uint8(i + 1), np.uint8(0))
+
+    flips = syndromes ^ messages
+    rows = np.nonzero(flips)[0]
+    flip_targets = block_indices[rows, flips[rows] - 1]
+    if use_replacement:
+        flat[flip_targets] ^= np.uint8(1)
+    else:
+        _adjust_pm1_flat(flat, flip_targets, rng)
+    return total_bits
+
+def _matrix_hamming_bits_flat(flat, indices, nbits: int, k: int):
+    block_cover = (1 << k) - 1
+    blocks = (nbits + k - 1) // k
+    if blocks * block_cover > indices.size:
+        raise ValueError("Ran out of positions for matrix-extraction block.")
+    block_indices = indices[: blocks * block_cover].reshape(-1, block_cover)
+    lsbs = flat[block_indices] & 1
+    syndromes = np.zeros(blocks, dtype=np.uint8)
+    for i in range(block_cover):
+        syndromes ^= np.where(lsbs[:, i] == 1, np.uint8(i + 1), np.uint8(0))
+    chunks = np.unpackbits(syndromes[:, None], axis=1)[:, -k:]
+    return chunks.reshape(-1)[:nbits]
+
+def _extract_matrix_hamming_flat(flat, indices, nbits: int, k: int) -> str:
+    bits = _matrix_hamming_bits_flat(flat, indices, nbits, k)
+    return (bits + np.uint8(ord("0"))).astype(np.uint8).tobytes().decode("ascii")
 
 def embed_bits(
     pixels,
     mode: str,
     positions: Sequence[Position],
-    bits: str,
+    bits,
     method: str,
     rng: random.Random,
     use_replacement_for_matrix: bool = False,
+    nbits: Optional[int] = None,
 ) -> int:
-    is_gray = mode == "L"
+    """Embed ``bits`` at ``positions``.
+
+    ``bits`` may be a "0"/"1" string, a uint8 array, or packed bytes. The
+    packed-bytes form never expands to an 8x bit-string: the NumPy path
+    unpacks to a 1x uint8 array and the fallback streams bits lazily.
+    ``nbits`` caps how many bits of a packed buffer are embedded.
+    """
+    packed = isinstance(bits, (bytes, bytearray, memoryview))
+    if np is not None and isinstance(pixels, np.ndarray):
+        if packed:
+            bits = np.unpackbits(np.frombuffer(bits, dtype=np.uint8))
+            if nbits is not None:
+                bits = bits[:nbits]
+        return embed_bits_flat(
+            pixels.reshape(-1),
+            positions_to_indices(positions),
+            bits,
+            method,
+            rng,
+            use_replacement_for_matrix=use_replacement_for_matrix,
+        )
+
+    if packed:
+        total = len(bits) * 8 if nbits is None else nbits
+        bit_iter = islice(
+            ((byte >> (7 - i)) & 1 for byte in bits for i in range(8)), total
+        )
+    else:
+        total = len(bits) if nbits is None else nbits
+        bit_iter = islice((1 if ch == "1" else 0 for ch in bits), total)
+
     if method == MATRIX_HAMMING:
-        return _embed_matrix_hamming(pixels, positions, bits, is_gray, rng, k=3, use_replacement=use_replacement_for_matrix)
+        return _embed_matrix_hamming(
+            pixels, positions, bit_iter, total, rng, k=3,
+            use_replacement=use_replacement_for_matrix,
+        )
 
+    buf = pixels.buf
     count = 0
-    for ch in bits:
+    if method == LSB_REPLACEMENT:
+
+        # Unconditional masked write: payload bits are effectively random,
+        # so a compare-before-write branch mispredicts half the time.
+        for target in bit_iter:
+            if count >= len(positions):
+                raise ValueError("Ran out of positions while embedding bits.")
+            idx = positions[count]
+            buf[idx] = (buf[idx] & 0xFE) | target
+            count += 1
+        return count
+    if method != LSB_MATCHING:
+        raise ValueError(f"Unknown embedding method: {method}")
+    for target in bit_iter:
         if count >= len(positions):
             raise ValueError("Ran out of positions while embedding bits.")
-        x, y, c = positions[count]
-        target = 1 if ch == "1" else 0
-        current = _get_lsb(pixels, x, y, c, is_gray)
-        if current != target:
-            if method == LSB_MATCHING:
-                _adjust_pm1(pixels, x, y, c, is_gray, rng)
-            elif method == LSB_REPLACEMENT:
-                _set_lsb_replacement(pixels, x, y, c, is_gray, target)
-            else:
-                raise ValueError(f"Unknown embedding method: {method}")
+        idx = positions[count]
+        if (buf[idx] & 1) != target:
+            _adjust_pm1(buf, idx, rng)
         count += 1
     return count
 
@@ -84,15 +243,44 @@ def extract_bits(
     nbits: int,
     method: str,
 ) -> str:
-    is_gray = mode == "L"
+    if np is not None and isinstance(pixels, np.ndarray):
+        return extract_bits_flat(
+            pixels.reshape(-1),
+            positions_to_indices(positions),
+            nbits,
+            method,
+        )
     if method == MATRIX_HAMMING:
-        return _extract_matrix_hamming(pixels, positions, nbits, is_gray, k=3)
+        return _extract_matrix_hamming(pixels, positions, nbits, k=3)
+
+    buf = pixels.buf
+    return "".join("1" if buf[p] & 1 else "0" for p in positions[:nbits])
 
-    out = []
-    for i in range(nbits):
-        x, y, c = positions[i]
-        out.append("1" if _get_lsb(pixels, x, y, c, is_gray) else "0")
-    return "".join(out)
+def extract_bytes(
+    pixels,
+    mode: str,
+    positions: Sequence[Position],
+    nbits: int,
+    method: str,
+) -> bytes:
+    """Extract ``nbits`` and pack them straight into bytes.
+
+    On the NumPy path this packs 8 LSBs per output byte in one vectorized
+    step, skipping the intermediate "0"/"1" string entirely. Trailing bits
+    short of a full byte are dropped, matching ``bits_to_bytes``.
+    """
+    if np is not None and isinstance(pixels, np.ndarray):
+        return extract_bytes_flat(
+            pixels.reshape(-1),
+            positions_to_indices(positions),
+            nbits,
+            method,
+        )
+    bit_str = extract_bits(pixels, mode, positions, nbits, method)
+    nbytes = len(bit_str) // 8
+    if nbytes == 0:
+        return b""
+    return int(bit_str[: nbytes * 8], 2).to_bytes(nbytes, "big")
 
 def positions_needed(nbits: int, method: str, k: int = 3) -> int:
     if method == MATRIX_HAMMING:
@@ -102,64 +290,60 @@ def positions_needed(nbits: int, method: str, k: int = 3) -> int:
     return nbits
 
 def _embed_matrix_hamming(
-    pixels,
+    pixels: FlatPixelBuffer,
     positions: Sequence[Position],
-    bits: str,
-    is_gray: bool,
+    bit_iter: Iterator[int],
+    total_bits: int,
     rng: random.Random,
     k: int,
     use_replacement: bool = False,
 ) -> int:
+    buf = pixels.buf
     block_cover = (1 << k) - 1
     pos_idx = 0
     bit_idx = 0
-    total_bits = len(bits)
     while bit_idx < total_bits:
         if pos_idx + block_cover > len(positions):
             raise ValueError("Ran out of positions for matrix-embedding block.")
-        block_positions = positions[pos_idx : pos_idx + block_cover]
-
-        cover_lsbs = [_get_lsb(pixels, x, y, c, is_gray) for (x, y, c) in block_positions]
-        message_slice = bits[bit_idx : bit_idx + k]
-        if len(message_slice) < k:
-            message_slice = message_slice + "0" * (k - len(message_slice))
-        message_int = int(message_slice, 2)
+        block_indices = positions[pos_idx : pos_idx + block_cover]
+        message_int = 0
+        for _ in range(k):
+            message_int = (message_int << 1) | next(bit_iter, 0)
 
         syndrome = 0
-        for i, lsb in enumerate(cover_lsbs, start=1):
-            if lsb:
+        for i, idx in enumerate(block_indices, start=1):
+            if buf[idx] & 1:
                 syndrome ^= i
         flip_pos = syndrome ^ message_int
         if flip_pos != 0:
-            x, y, c = block_positions[flip_pos - 1]
+            idx = block_indices[flip_pos - 1]
             if use_replacement:
-                curr = _get_lsb(pixels, x, y, c, is_gray)
-                _set_lsb_replacement(pixels, x, y, c, is_gray, 1 - curr)
+                buf[idx] ^= 1
             else:
-                _adjust_pm1(pixels, x, y, c, is_gray, rng)
+                _adjust_pm1(buf, idx, rng)
 
         pos_idx += block_cover
         bit_idx += k
     return total_bits
 
 def _extract_matrix_hamming(
-    pixels,
+    pixels: FlatPixelBuffer,
     positions: Sequence[Position],
     nbits: int,
-    is_gray: bool,
     k: int,
 ) -> str:
+    buf = pixels.buf
     block_cover = (1 << k) - 1
     pos_idx = 0
     bits_out: List[str] = []
     remaining = nbits
     while remaining > 0:
-        block_positions = positions[pos_idx : pos_idx + block_cover]
-        if len(block_positions) < block_cover:
+        block_indices = positions[pos_idx : pos_idx + block_cover]
+        if len(block_indices) < block_cover:
             raise ValueError("Ran out of positions for matrix-extraction block.")
         syndrome = 0
-        for i, (x, y, c) in enumerate(block_positions, start=1):
-            if _get_lsb(pixels, x, y, c, is_gray):
+        for i, idx in enumerate(block_indices, start=1):
+            if buf[idx] & 1:
                 syndrome ^= i
         chunk = format(syndrome, f"0{k}b")
         take = min(k, remaining)
@@ -220,65 +404,83 @@ def build_adaptive_position_mask(
     image: Image.Image,
     min_cost_percentile: float = 0.40,
     cost_mode: str = COST_LAPLACIAN,
-) -> "set[Tuple[int, int]]":
+) -> "set[int]":
+    """Return the set of selected pixel indices (``y * width + x``)."""
     if not (0.0 <= min_cost_percentile < 1.0):
         raise ValueError("min_cost_percentile must be in [0, 1)")
 
     if cost_mode == COST_HILL:
         cost_img = _hill_cost_map(image)
-        data = list(cost_img.getdata())
-        if not data:
-            raise ValueError("Empty cost map — image has no pixels.")
-        sorted_vals = sorted(data)
-
-
-        if sorted_vals[0] == sorted_vals[-1]:
-            accept = lambda v: True
-        else:
-
-            keep_top = int(len(sorted_vals) * (1.0 - min_cost_percentile))
-            keep_top = max(1, keep_top)
-            cutoff = sorted_vals[keep_top - 1]
-            accept = lambda v: v <= cutoff
     elif cost_mode == COST_LAPLACIAN:
         cost_img = _laplacian_edge_map(image)
-        data = list(cost_img.getdata())
-        if not data:
-            raise ValueError("Empty cost map — image has no pixels.")
-        sorted_vals = sorted(data)
+    else:
+        raise ValueError(f"Unknown cost_mode: {cost_mode!r}")
 
+    if np is not None:
 
-        if sorted_vals[0] == sorted_vals[-1]:
-            accept = lambda v: True
+        # Same cutoff rules as the fallback below, but with np.partition
+        # for the order statistic instead of a full Python sort, and one
+        # vectorized comparison instead of a per-pixel accept() call.
+        values = np.frombuffer(cost_img.tobytes(), dtype=np.uint8)
+        if values.size == 0:
+            raise ValueError("Empty cost map — image has no pixels.")
+        if int(values.min()) == int(values.max()):
+            selected = np.arange(values.size)
+        elif cost_mode == COST_HILL:
+            keep_top = max(1, int(values.size * (1.0 - min_cost_percentile)))
+            cutoff = int(np.partition(values, keep_top - 1)[keep_top - 1])
+            selected = np.nonzero(values <= cutoff)[0]
         else:
-
-            cutoff_idx = int(len(sorted_vals) * min_cost_percentile)
-            cutoff = sorted_vals[cutoff_idx] if cutoff_idx < len(sorted_vals) else 0
+            cutoff_idx = int(values.size * min_cost_percentile)
+            cutoff = (
+                int(np.partition(values, cutoff_idx)[cutoff_idx])
+                if cutoff_idx < values.size
+                else 0
+            )
             if cutoff <= 0:
                 cutoff = 1
-            accept = lambda v: v >= cutoff
+            selected = np.nonzero(values >= cutoff)[0]
+        return set(selected.tolist())
+
+    data = list(cost_img.getdata())
+    if not data:
+        raise ValueError("Empty cost map — image has no pixels.")
+    sorted_vals = sorted(data)
+
+    if sorted_vals[0] == sorted_vals[-1]:
+        accept = lambda v: True
+    elif cost_mode == COST_HILL:
+        keep_top = int(len(sorted_vals) * (1.0 - min_cost_percentile))
+        keep_top = max(1, keep_top)
+        cutoff = sorted_vals[keep_top - 1]
+        accept = lambda v: v <= cutoff
     else:
-        raise ValueError(f"Unknown cost_mode: {cost_mode!r}")
+        cutoff_idx = int(len(sorted_vals) * min_cost_percentile)
+        cutoff = sorted_vals[cutoff_idx] if cutoff_idx < len(sorted_vals) else 0
+        if cutoff <= 0:
+            cutoff = 1
+        accept = lambda v: v >= cutoff
 
-    width, _height = cost_img.size
     mask = set()
     for idx, v in enumerate(data):
         if accept(v):
-            mask.add((idx % width, idx // width))
+            mask.add(idx)
     return mask
 
 def filter_positions_by_mask(
     positions: Iterable[Position],
-    mask: "set[Tuple[int, int]]",
+    mask: "set[int]",
+    bands: int,
 ) -> Iterator[Position]:
     for pos in positions:
-        if (pos[0], pos[1]) in mask:
+        if pos // bands in mask:
             yield pos
 
 def iter_positions_in_order(
     positions: Sequence[Position],
-    mask: Optional["set[Tuple[int, int]]"],
+    mask: Optional["set[int]"],
+    bands: int,
 ) -> List[Position]:
     if mask is None:
         return list(positions)
-    return [p for p in positions if (p[0], p[1]) in mask]
+    return [p for p in positions if p // bands in mask]
@@ -22,7 +22,7 @@ from .constants import (
     YK_CHALLENGE_NONCE_LEN,
 )
 from .exceptions import HeaderParameterOutOfRange
-from .kdf import KDF_ARGON2ID, KDF_PBKDF2, KdfParams
+from .kdf import KDF_ARGON2ID, KDF_PBKDF2, KDF_PBKDF2_SHA512, KdfParams
 
 MAGIC = 0x58
 
@@ -154,7 +154,7 @@ class Header:
             if not (1 <= self.kdf.parallelism <= 255):
                 raise ValueError("Argon2 parallelism out of range")
             return struct.pack(">BIB2x", self.kdf.time_cost, self.kdf.memory_cost_kib, self.kdf.parallelism)
-        if self.kdf.kdf_id == KDF_PBKDF2:
+        if self.kdf.kdf_id in (KDF_PBKDF2, KDF_PBKDF2_SHA512):
             return struct.pack(">I4x", self.kdf.iterations)
         raise ValueError(f"Unknown kdf_id: 0x{self.kdf.kdf_id:02x}")
 
@@ -232,11 +232,11 @@ class Header:
                 memory_cost_kib=memory_cost,
                 parallelism=parallelism,
             )
-        if kdf_id == KDF_PBKDF2:
+        if kdf_id in (KDF_PBKDF2, KDF_PBKDF2_SHA512):
             (iterations,) = struct.unpack(">I4x", kdf_blob)
             if not (PBKDF2_MIN_ITERATIONS <= iterations <= PBKDF2_MAX_ITERATIONS):
                 raise HeaderParameterOutOfRange("Header rejected: KDF parameters out of range")
-            return KdfParams(kdf_id=KDF_PBKDF2, iterations=iterations)
+            return KdfParams(kdf_id=kdf_id, iterations=iterations)
         raise ValueError(f"Unknown kdf_id in header: 0x{kdf_id:02x}")
 
 
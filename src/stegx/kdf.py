@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import struct as _struct
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional
 
@@ -23,6 +25,7 @@ _MAX_FACTOR_LEN = 16 * 1024 * 1024
 
 KDF_ARGON2ID = 0x02
 KDF_PBKDF2 = 0x01
+KDF_PBKDF2_SHA512 = 0x03
 
 MASTER_KEY_LEN = 32
 
@@ -32,6 +35,12 @@ ARGON2_PARALLELISM = 4
 
 PBKDF2_ITERATIONS = 600_000
 
+
+# Hash algorithm descriptors are stateless in `cryptography`; share single
+# instances instead of allocating one per KDF/HMAC construction.
+_SHA256 = hashes.SHA256()
+_SHA512 = hashes.SHA512()
+
 HKDF_INFO_AES = b"stegx/v2/aes-256-gcm"
 HKDF_INFO_CHACHA = b"stegx/v2/chacha20-poly1305"
 HKDF_INFO_SEED = b"stegx/v2/pixel-shuffle-seed"
@@ -57,7 +66,7 @@ class KdfParams:
 
     @classmethod
     def default_pbkdf2(cls) -> "KdfParams":
-        return cls(kdf_id=KDF_PBKDF2, iterations=PBKDF2_ITERATIONS)
+        return cls(kdf_id=KDF_PBKDF2_SHA512, iterations=PBKDF2_ITERATIONS)
 
 def _frame_factor(tag: bytes, data: bytes) -> bytes:
     if len(tag) != 4:
@@ -81,7 +90,7 @@ def _mix_factors(
     )
 
 def hkdf_extract(salt: bytes, ikm: bytes) -> bytes:
-    mac = _CryptoHMAC(salt, hashes.SHA256())
+    mac = _CryptoHMAC(salt, _SHA256)
     mac.update(ikm)
     return mac.finalize()
 
@@ -116,9 +125,11 @@ def derive_master_key(
             type=Type.ID,
         )
 
-    if params.kdf_id == KDF_PBKDF2:
+    if params.kdf_id in (KDF_PBKDF2, KDF_PBKDF2_SHA512):
+
+        algorithm = _SHA512 if params.kdf_id == KDF_PBKDF2_SHA512 else _SHA256
         kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
+            algorithm=algorithm,
             length=MASTER_KEY_LEN,
             salt=salt,
             iterations=params.iterations,
@@ -133,7 +144,7 @@ def hkdf_subkey(master_key: bytes, info: bytes, length: int = 32) -> bytes:
             f"Master key must be exactly {MASTER_KEY_LEN} bytes "
             f"(got {len(master_key)})."
         )
-    expander = HKDFExpand(algorithm=hashes.SHA256(), length=length, info=info)
+    expander = HKDFExpand(algorithm=_SHA256, length=length, info=info)
     return expander.derive(master_key)
 
 def seed_int_from_subkey(subkey: bytes) -> int:
@@ -141,15 +152,36 @@ def seed_int_from_subkey(subkey: bytes) -> int:
         raise ValueError("Sub-key too short to derive seed.")
     return int.from_bytes(subkey[:8], "big")
 
+_LEGACY_SEED_CACHE: "OrderedDict[bytes, int]" = OrderedDict()
+_LEGACY_SEED_CACHE_MAX = 16
+
 def derive_legacy_seed_from_password(password: str) -> int:
+
+    # Keyed by a digest rather than functools.lru_cache so the raw password
+    # string is not pinned in the cache. The derivation itself (PBKDF2-SHA256,
+    # 390k iterations, fixed salt) is part of the legacy format and must not
+    # change.
+    cache_key = hashlib.sha256(
+        b"stegx/v1/legacy-seed-cache\x00" + password.encode("utf-8")
+    ).digest()
+    cached = _LEGACY_SEED_CACHE.get(cache_key)
+    if cached is not None:
+        _LEGACY_SEED_CACHE.move_to_end(cache_key)
+        return cached
+
     kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
+        algorithm=_SHA256,
         length=8,
         salt=b"stegx_pixel_shuffle_v1",
         iterations=390_000,
     )
     key = kdf.derive(password.encode("utf-8"))
-    return int.from_bytes(key, "big")
+    seed = int.from_bytes(key, "big")
+
+    _LEGACY_SEED_CACHE[cache_key] = seed
+    while len(_LEGACY_SEED_CACHE) > _LEGACY_SEED_CACHE_MAX:
+        _LEGACY_SEED_CACHE.popitem(last=False)
+    return seed
 
 def calibrate_argon2_for_target_ms(target_ms: int = 500) -> KdfParams:
     import time
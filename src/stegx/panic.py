@@ -134,7 +134,8 @@ def _output_lock(output_path: str) -> Iterator[None]:
         if owned:
             _safe_unlink(lock_path)
 
-Position = Tuple[int, int, int]
+# Flat channel-slot index into the image buffer; see embedding.Position.
+Position = int
 
 PANIC_MODE_SILENT = "silent"
 PANIC_MODE_DECOY = "decoy"
@@ -295,22 +296,15 @@ def _atomic_replace(src: str, dst: str) -> None:
         f"panic: atomic replace failed after {_REPLACE_RETRIES} attempts: {last_err}"
     )
 
-def _overwrite_lsbs_randomly(image: Image.Image, positions: Sequence) -> None:
+def _overwrite_lsbs_randomly(image: Image.Image, positions: Sequence[Position]) -> None:
     if not positions:
         return
-    pixels = image.load()
-    is_gray = image.mode == "L"
+    buf = bytearray(image.tobytes())
     bits = os.urandom((len(positions) + 7) // 8)
-    for idx, pos in enumerate(positions):
-        x, y, c = pos
+    for idx, p in enumerate(positions):
         bit = (bits[idx // 8] >> (idx & 7)) & 1
-        if is_gray:
-            v = pixels[x, y]
-            pixels[x, y] = (v & ~1) | bit
-        else:
-            pixel = list(pixels[x, y])
-            pixel[c] = (pixel[c] & ~1) | bit
-            pixels[x, y] = tuple(pixel)
+        buf[p] = (buf[p] & 0xFE) | bit
+    image.frombytes(bytes(buf))
 
 def build_panic_payload(
     sacrificial_bytes: bytes,
@@ -32,17 +32,21 @@ def bytes_to_bits(data: bytes) -> str:
 def bits_match_sentinel(bits: str, sentinel: bytes) -> bool:
     if len(bits) != SENTINEL_BITS:
         return False
-    observed = _bits_to_bytes(bits)
+    try:
+        observed = _bits_to_bytes(bits)
+    except ValueError:
+        return False
+    return hmac.compare_digest(observed, sentinel)
+
+def bytes_match_sentinel(observed: bytes, sentinel: bytes) -> bool:
+    if len(observed) != SENTINEL_LEN:
+        return False
     return hmac.compare_digest(observed, sentinel)
 
 def _bits_to_bytes(bits: str) -> bytes:
-    out = bytearray(len(bits) // 8)
-    for i in range(len(out)):
-        byte = 0
-        for j in range(8):
-            byte = (byte << 1) | (1 if bits[i * 8 + j] == "1" else 0)
-        out[i] = byte
-    return bytes(out)
+    if not bits:
+        return b""
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
 
 def sentinel_bit_length() -> int:
     return SENTINEL_BITS
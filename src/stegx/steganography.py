@@ -4,12 +4,18 @@ import hashlib
 import logging
 import os
 import random
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Callable, List, Optional, Sequence, Tuple
 
 from PIL import Image
 from cryptography.exceptions import InvalidTag
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from . import embedding as emb
 from .compression import MODE_BEST as _CX_MODE_BEST, MODE_FAST as _CX_MODE_FAST
 from .constants import (
@@ -36,6 +42,7 @@ from .embedding import (
     build_adaptive_position_mask,
     embed_bits,
     extract_bits,
+    extract_bytes,
     positions_needed,
 )
 from .header import FLAG_ADAPTIVE, FLAG_MATRIX, FLAG_YUBIKEY, Header
@@ -53,14 +60,14 @@ from .secure_memory import SecureBuffer
 from .sentinel import (
     SENTINEL_BITS,
     SENTINEL_LEN,
-    bits_match_sentinel,
-    bytes_to_bits,
+    bytes_match_sentinel,
     cover_fingerprint,
     derive_sentinel,
 )
 
 DATA_SENTINEL = b"\x53\x54\x45\x47\x58\x5f\x45\x4f\x44"
 SENTINEL_LENGTH_BITS = len(DATA_SENTINEL) * 8
+_DATA_SENTINEL_BIT_STR = "".join(format(b, "08b") for b in DATA_SENTINEL)
 _POSITION_KDF_APP_KEY = b"stegx/v2/position-kdf"
 _POSITION_KDF_PARAMS = KdfParams.default_argon2id()
 
@@ -80,10 +87,29 @@ def _head_byte_count_from_embed(embed_bytes: bytes) -> int:
         return HEAD_BYTES_V3
     return HEAD_BYTES_V2
 
-Position = Tuple[int, int, int]
+# Positions are flat channel-slot indices into the image's raw byte buffer
+# ((y * width + x) * bands + c); see embedding.Position.
+Position = int
 
 
 def bits_to_bytes(bits) -> bytes:
+    if np is not None:
+        if isinstance(bits, str):
+            arr = np.frombuffer(bits.encode("ascii"), dtype=np.uint8) - ord("0")
+        elif isinstance(bits, np.ndarray):
+            arr = bits.astype(np.uint8, copy=False)
+        elif isinstance(bits, (list, tuple)):
+            # packbits sets the bit for any nonzero element, matching the
+            # truthy semantics of the pure-Python loop below.
+            try:
+                arr = np.asarray(bits, dtype=np.uint8)
+            except (TypeError, ValueError):
+                arr = None
+        else:
+            arr = None
+        if arr is not None:
+            return np.packbits(arr[: (arr.size // 8) * 8]).tobytes()
+
     def _as_int(b) -> int:
 
         if isinstance(b, str):
@@ -108,14 +134,12 @@ def bits_to_bytes(bits) -> bytes:
     return bytes(out)
 
 def bytes_to_bits_iterator(byte_data: bytes):
-    for byte in byte_data:
-        for i in range(8):
-            yield (byte >> (7 - i)) & 1
+    if np is not None:
+        return iter(np.unpackbits(np.frombuffer(bytes(byte_data), dtype=np.uint8)))
+    return ((byte >> (7 - i)) & 1 for byte in byte_data for i in range(8))
 
 
-def calculate_lsb_capacity(image: Image.Image) -> int:
-    width, height = image.size
-    mode = image.mode
+def calculate_lsb_capacity_for(width: int, height: int, mode: str) -> int:
     if mode in ("RGB", "RGBA"):
         capacity = width * height * 3
     elif mode == "L":
@@ -127,10 +151,15 @@ def calculate_lsb_capacity(image: Image.Image) -> int:
     effective = capacity - HEAD_BYTES_V3 * 8
     return max(0, effective)
 
+def calculate_lsb_capacity(image: Image.Image) -> int:
+    width, height = image.size
+    return calculate_lsb_capacity_for(width, height, image.mode)
+
 def _open_cover(path: str) -> Image.Image:
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Cover image not found: {path}")
-    image = Image.open(path)
+    try:
+        image = Image.open(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Cover image not found: {path}") from None
     if image.mode == "P":
         image = image.convert("RGBA")
     elif image.mode not in ("RGB", "RGBA", "L"):
@@ -142,12 +171,17 @@ def _open_cover(path: str) -> Image.Image:
 def _all_positions(image: Image.Image) -> List[Position]:
     width, height = image.size
     channels = 3 if image.mode in ("RGB", "RGBA") else 1
-    positions: List[Position] = []
-    for y in range(height):
-        for x in range(width):
-            for c in range(channels):
-                positions.append((x, y, c))
-    return positions
+    bands = len(image.getbands())
+    if channels == bands:
+        return list(range(width * height * channels))
+
+    # RGBA: the alpha byte is never an embedding slot, so the flat indices
+    # skip every fourth byte of the buffer.
+    return [
+        base + c
+        for base in range(0, width * height * bands, bands)
+        for c in range(channels)
+    ]
 
 def _shuffle_positions(positions: List[Position], seed_int: int) -> List[Position]:
     local = list(positions)
@@ -166,7 +200,8 @@ def _apply_adaptive(
     )
     if not mask:
         return None
-    filtered = [p for p in positions if (p[0], p[1]) in mask]
+    bands = len(image.getbands())
+    filtered = [p for p in positions if p // bands in mask]
     if not filtered:
         return None
     return filtered
@@ -186,12 +221,41 @@ def _derive_body_seed(head_seed_int: int, header_salt: bytes, fingerprint: bytes
     info = HKDF_INFO_BODY_SEED + b"\x00" + fingerprint + b"\x00" + header_salt
     return int.from_bytes(hkdf_subkey(prk, info, length=8), "big")
 
+_POSITION_MATERIAL_CACHE: "OrderedDict[bytes, Tuple[int, bytes, int]]" = OrderedDict()
+_POSITION_MATERIAL_CACHE_MAX = 8
+
+def _position_material_cache_key(
+    password: str,
+    keyfile_bytes: Optional[bytes],
+    fingerprint: bytes,
+    yubikey_response: Optional[bytes],
+) -> bytes:
+    digest = hashlib.sha256(b"stegx/v3/position-material-cache")
+    for part in (
+        password.encode("utf-8"),
+        keyfile_bytes or b"",
+        yubikey_response or b"",
+        fingerprint,
+    ):
+        digest.update(len(part).to_bytes(4, "big"))
+        digest.update(part)
+    return digest.digest()
+
 def _derive_position_material(
     password: str,
     keyfile_bytes: Optional[bytes],
     fingerprint: bytes,
     yubikey_response: Optional[bytes] = None,
 ) -> Tuple[int, bytes, int]:
+
+    cache_key = _position_material_cache_key(
+        password, keyfile_bytes, fingerprint, yubikey_response
+    )
+    cached = _POSITION_MATERIAL_CACHE.get(cache_key)
+    if cached is not None:
+        _POSITION_MATERIAL_CACHE.move_to_end(cache_key)
+        return cached
+
     position_salt = _derive_position_salt(fingerprint)
     with SecureBuffer(
         data=derive_master_key(
@@ -213,13 +277,19 @@ def _derive_position_material(
         sentinel_key = hkdf_subkey(
             bytes(position_key), HKDF_INFO_SENTINEL + fingerprint, length=32
         )
-        return (
+        material = (
             seed_int_from_subkey(seed_sub),
             sentinel_key,
             seed_int_from_subkey(decoy_sub),
         )
 
 
+    _POSITION_MATERIAL_CACHE[cache_key] = material
+    while len(_POSITION_MATERIAL_CACHE) > _POSITION_MATERIAL_CACHE_MAX:
+        _POSITION_MATERIAL_CACHE.popitem(last=False)
+    return material
+
+
 @dataclass
 class EmbedOptions:
     dual_cipher: bool = False
@@ -332,26 +402,24 @@ def _embed_stream(
 
     head_bytes_data = embed_bytes[:head_byte_count]
     body_bytes_data = embed_bytes[head_byte_count:]
-    head_bits = bytes_to_bits(head_bytes_data)
-    body_bits = bytes_to_bits(body_bytes_data)
-
 
     head_method = LSB_REPLACEMENT if (method_ct == LSB_REPLACEMENT or is_adaptive) else LSB_MATCHING
 
     embed_bits(
         pixels=pixels,
         mode=mode,
-        positions=head_positions[: len(head_bits)],
-        bits=head_bits,
+        positions=head_positions[: len(head_bytes_data) * 8],
+        bits=head_bytes_data,
         method=head_method,
         rng=rng,
     )
-    if body_bits:
+    if body_bytes_data:
+        body_nbits = len(body_bytes_data) * 8
         embed_bits(
             pixels=pixels,
             mode=mode,
-            positions=body_positions[: positions_needed(len(body_bits), method_ct)],
-            bits=body_bits,
+            positions=body_positions[: positions_needed(body_nbits, method_ct)],
+            bits=body_bytes_data,
             method=method_ct,
             rng=rng,
             use_replacement_for_matrix=is_adaptive,
@@ -405,6 +473,18 @@ def embed_v2(
             decoy_region = []
             real_region = all_positions
 
+        # Necessary-condition capacity check before any KDF or encryption
+        # work: the embedded stream can only grow from the plaintext (header,
+        # AEAD tags), so an oversized payload should fail before paying
+        # Argon2id. The exact check against the real stream runs later.
+        min_needed = (SENTINEL_LEN + HEADER_SIZE_V3_BASE) * 8 + positions_needed(
+            len(inner_plaintext) * 8, _determine_method(options)
+        )
+        if min_needed > len(real_region):
+            raise InsufficientCapacity(
+                f"Insufficient capacity for real payload: need at least"
+                f" {min_needed} positions, have {len(real_region)}."
+            )
 
         seed_int, sentinel_key, decoy_seed_int = _derive_position_material(
             password, options.keyfile_bytes, fingerprint
@@ -448,7 +528,12 @@ def embed_v2(
             label="real payload",
         )
 
-        pixels = image.load()
+        if np is not None:
+            canvas = np.array(image, dtype=np.uint8)
+            pixels = canvas
+        else:
+            canvas = None
+            pixels = emb.FlatPixelBuffer.from_image(image)
 
         _embed_stream(
             pixels=pixels,
@@ -486,8 +571,17 @@ def embed_v2(
                 fingerprint=fingerprint,
             )
 
+        # Save straight from the working buffer instead of copying it back
+        # into the cover Image first; fromarray/frombuffer share memory.
+        if canvas is not None:
+            stego = Image.fromarray(canvas)
+        else:
+            stego = Image.frombuffer(
+                image.mode, image.size, pixels.buf, "raw", image.mode, 0, 1
+            )
+
         encoder_params = sniff_png_encoder(cover_image_path)
-        save_as_stego_png(image, output_image_path, encoder_params, options.preserve_cover_encoding)
+        save_as_stego_png(stego, output_image_path, encoder_params, options.preserve_cover_encoding)
 
         logging.info(
             "StegX v3 embed: cover=%s out=%s payload=%d B adaptive=%s matrix=%s dual=%s decoy=%s",
@@ -519,16 +613,16 @@ def _fill_phantom_region(
     phantom_seed = int.from_bytes(os.urandom(8), "big")
     phantom_positions = reorder_region(region, phantom_seed)[:phantom_bits_len]
     phantom_bytes = os.urandom((phantom_bits_len + 7) // 8)
-    phantom_bits = bytes_to_bits(phantom_bytes)[:phantom_bits_len]
 
     rng = random.Random(int.from_bytes(fingerprint[:8], "big") ^ 0x5A5A5A5A)
     embed_bits(
         pixels=pixels,
         mode=image.mode,
         positions=phantom_positions,
-        bits=phantom_bits,
+        bits=phantom_bytes,
         method=LSB_MATCHING,
         rng=rng,
+        nbits=phantom_bits_len,
     )
     logging.debug("Phantom decoy fill: %d random bits embedded.", phantom_bits_len)
 
@@ -683,10 +777,12 @@ def extract_v2_with_region(
     yubikey_factory: Optional[Callable[[bytes], bytes]] = None,
     allow_v1: bool = False,
 ) -> Tuple[bytes, str]:
-    if not os.path.exists(stego_image_path):
-        raise FileNotFoundError(f"Stego image not found: {stego_image_path}")
-
-    image = Image.open(stego_image_path)
+    try:
+        image = Image.open(stego_image_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Stego image not found: {stego_image_path}"
+        ) from None
     try:
         if image.mode == "P":
             image = image.convert("RGBA")
@@ -696,6 +792,10 @@ def extract_v2_with_region(
         fingerprint = cover_fingerprint(image)
         all_positions = _all_positions(image)
 
+        if np is not None:
+            pixels = np.asarray(image, dtype=np.uint8)
+        else:
+            pixels = emb.FlatPixelBuffer.from_image(image)
 
         seed_int, sentinel_key, _ = _derive_position_material(
             password, keyfile_bytes, fingerprint, yubikey_response
@@ -719,7 +819,8 @@ def extract_v2_with_region(
             for positions in candidate_lists:
                 try:
                     data = _read_and_decrypt(
-                        image=image,
+                        pixels=pixels,
+                        mode=image.mode,
                         positions=positions,
                         expected_sentinel=expected_sentinel,
                         password=password,
@@ -778,7 +879,8 @@ class _SentinelMismatch(Exception):
     pass
 
 def _read_and_decrypt(
-    image: Image.Image,
+    pixels,
+    mode: str,
     positions: Sequence[Position],
     expected_sentinel: bytes,
     password: str,
@@ -788,17 +890,14 @@ def _read_and_decrypt(
     fingerprint: bytes = b"",
     head_seed_int: int = 0,
 ) -> bytes:
-    pixels = image.load()
-    mode = image.mode
-
     if len(positions) < SENTINEL_BITS:
         raise _SentinelMismatch()
 
 
-    sentinel_bits = extract_bits(
+    sentinel_observed = extract_bytes(
         pixels, mode, positions[:SENTINEL_BITS], SENTINEL_BITS, LSB_REPLACEMENT
     )
-    if not bits_match_sentinel(sentinel_bits, expected_sentinel):
+    if not bytes_match_sentinel(sentinel_observed, expected_sentinel):
         raise _SentinelMismatch()
 
 
@@ -806,14 +905,13 @@ def _read_and_decrypt(
     if len(positions) < SENTINEL_BITS + base_peek_bits:
         raise CorruptedPayload("Insufficient positions for header peek.")
 
-    raw_base_bits = extract_bits(
+    raw_base_bytes = extract_bytes(
         pixels,
         mode,
         positions[SENTINEL_BITS : SENTINEL_BITS + base_peek_bits],
         base_peek_bits,
         LSB_REPLACEMENT,
     )
-    raw_base_bytes = bits_to_bytes(raw_base_bits)
 
     version = raw_base_bytes[1]
 
@@ -840,13 +938,13 @@ def _read_and_decrypt(
             wrap_end   = SENTINEL_BITS + full_header_bits
             if len(positions) < wrap_end:
                 raise CorruptedPayload("Insufficient positions for KMS wrap data.")
-            wrap_bits = extract_bits(
+            wrap_bytes = extract_bytes(
                 pixels, mode,
                 positions[wrap_start:wrap_end],
                 kms_wrap_len * 8,
                 LSB_REPLACEMENT,
             )
-            header_bytes = raw_base_bytes[:HEADER_SIZE_V3_BASE] + bits_to_bytes(wrap_bits)
+            header_bytes = raw_base_bytes[:HEADER_SIZE_V3_BASE] + wrap_bytes
 
     else:
         raise ValueError(f"Unsupported header version: 0x{version:02x}")
@@ -885,14 +983,13 @@ def _read_and_decrypt(
     if len(body_remaining) < ct_positions_needed:
         raise CorruptedPayload("Insufficient positions for ciphertext.")
 
-    ct_bits = extract_bits(
+    ciphertext = extract_bytes(
         pixels,
         mode,
         body_remaining[:ct_positions_needed],
         ct_len_bits,
         ct_method,
     )
-    ciphertext = bits_to_bytes(ct_bits)
 
     full_encrypted = header_bytes + ciphertext
     try:
@@ -909,26 +1006,30 @@ def _try_extract_legacy_v1(image: Image.Image, password: str) -> bytes:
     all_positions = _all_positions(image)
     positions = _shuffle_positions(all_positions, seed_int)
 
-    pixels = image.load()
-    mode = image.mode
-
-    extracted: List[str] = []
-    buf = ""
-    sentinel_str = "".join(format(b, "08b") for b in DATA_SENTINEL)
-
-
-    for x, y, c in positions:
-        lsb = (pixels[x, y][c] if mode in ("RGB", "RGBA") else pixels[x, y]) & 1
-        extracted.append(str(lsb))
-        buf += str(lsb)
-        if len(buf) > SENTINEL_LENGTH_BITS:
-            buf = buf[1:]
-        if len(buf) == SENTINEL_LENGTH_BITS and buf == sentinel_str:
-            data_bits = "".join(extracted[:-SENTINEL_LENGTH_BITS])
-            encrypted = bits_to_bytes(data_bits)
-            return decrypt_legacy_v1(encrypted, password)
+    if np is not None:
+
+        # The v1 payload is whole bytes, so the sentinel always lands on a
+        # byte boundary of the bit stream: pack every LSB once and scan the
+        # packed bytes with bytes.find (a memchr-speed search in libc).
+        arr = np.asarray(image, dtype=np.uint8)
+        packed = emb.extract_bytes_flat(
+            arr.reshape(-1),
+            emb.positions_to_indices(positions),
+            len(positions),
+            LSB_REPLACEMENT,
+        )
+        idx = packed.find(DATA_SENTINEL)
+        if idx == -1:
+            raise ValueError("Legacy v1 sentinel not found.")
+        return decrypt_legacy_v1(packed[:idx], password)
 
-    raise ValueError("Legacy v1 sentinel not found.")
+    flat = emb.FlatPixelBuffer.from_image(image)
+    buf = flat.buf
+    bit_str = "".join("1" if buf[p] & 1 else "0" for p in positions)
+    idx = bit_str.find(_DATA_SENTINEL_BIT_STR)
+    if idx == -1:
+        raise ValueError("Legacy v1 sentinel not found.")
+    return decrypt_legacy_v1(bits_to_bytes(bit_str[:idx]), password)
 
 
 def embed_data(
@@ -949,17 +1050,23 @@ def get_seed_from_password(password: str) -> int:
 
 def generate_pixel_positions(width: int, height: int, channels: int, password: str):
     seed_int = derive_legacy_seed_from_password(password)
-    positions: List[Position] = []
-    for y in range(height):
-        for x in range(width):
-            for c in range(channels):
-                positions.append((x, y, c))
+    positions: List[Tuple[int, int, int]] = [
+        (x, y, c)
+        for y in range(height)
+        for x in range(width)
+        for c in range(channels)
+    ]
+
+    # The Mersenne-Twister shuffle is part of the on-disk format: every
+    # existing stego image was written with this exact permutation, so the
+    # PRNG here can never be swapped for a faster one.
     random.Random(seed_int).shuffle(positions)
     return positions
 
 __all__ = [
     "EmbedOptions",
     "calculate_lsb_capacity",
+    "calculate_lsb_capacity_for",
     "embed_data",
     "embed_v2",
     "extract_data",
@@ -4,9 +4,21 @@ import logging
 import os
 import re
 import tarfile
-import zlib
+try:
+    # Drop-in zlib API with SIMD-accelerated DEFLATE/CRC when the optional
+    # python-zlib-ng package is installed.
+    from zlib_ng import zlib_ng as zlib
+except ImportError:
+    import zlib
 from typing import List, Optional, Tuple
 
+try:
+    # Rust-backed JSON codec; payload metadata is small, but orjson both
+    # serializes faster and returns bytes directly, skipping one encode.
+    import orjson
+except ImportError:
+    orjson = None
+
 from . import compression as _cx
 from .constants import MAX_BUNDLE_MEMBERS, MAX_BUNDLE_TOTAL_BYTES
 from .exceptions import CorruptedPayload, EmptyPayloadError, TarExtractionError
@@ -36,7 +48,10 @@ def setup_logging(level=logging.INFO):
         logger.propagate = False
 
 def compress_data(data: bytes) -> bytes:
-    return zlib.compress(data, level=zlib.Z_BEST_COMPRESSION)
+    # Level 6 compresses several times faster than Z_BEST_COMPRESSION for a
+    # near-identical ratio; payloads that want maximum ratio go through
+    # compression.compress_best (zstd/lzma/brotli) instead of this helper.
+    return zlib.compress(data, level=6)
 
 def decompress_data(compressed_data: bytes) -> bytes:
     return zlib.decompress(compressed_data)
@@ -133,9 +148,29 @@ def create_payload_from_bytes(
         metadata[META_PANIC] = True
         if panic_mode:
             metadata[META_PANIC_MODE] = panic_mode
-    metadata_bytes = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    metadata_bytes = _meta_dumps(metadata)
     metadata_len_bytes = len(metadata_bytes).to_bytes(4, byteorder="little")
-    return metadata_len_bytes + metadata_bytes + file_data
+
+    # join() preallocates the exact result size, so file_data is copied once
+    # rather than twice as with chained `+` concatenation.
+    return b"".join((metadata_len_bytes, metadata_bytes, file_data))
+
+def _meta_dumps(metadata: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(metadata)
+    return json.dumps(
+        metadata, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+def _meta_loads(blob: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob.decode("utf-8"))
+
+if orjson is not None:
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError, orjson.JSONDecodeError)
+else:
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError,)
 
 def create_payload(
     file_path: str,
@@ -199,18 +234,22 @@ def parse_payload_full(
         raise CorruptedPayload("Invalid payload: Too short to contain metadata length.")
 
     try:
-        metadata_len = int.from_bytes(payload[:4], byteorder="little")
+        # A memoryview keeps the header parse and file-data slice zero-copy;
+        # only the small metadata blob is materialized for json.loads, and
+        # the uncompressed branch copies once when producing the result.
+        mv = memoryview(payload)
+        metadata_len = int.from_bytes(mv[:4], byteorder="little")
         logging.debug("Expected metadata length: %d bytes", metadata_len)
 
         if len(payload) < 4 + metadata_len:
             raise CorruptedPayload("Invalid payload: Too short to contain metadata.")
 
-        metadata_bytes = payload[4: 4 + metadata_len]
-        file_data = payload[4 + metadata_len:]
+        metadata_bytes = bytes(mv[4: 4 + metadata_len])
+        file_data = mv[4 + metadata_len:]
         logging.debug("Actual metadata bytes length: %d", len(metadata_bytes))
         logging.debug("File data length: %d", len(file_data))
 
-        metadata = json.loads(metadata_bytes.decode("utf-8"))
+        metadata = _meta_loads(metadata_bytes)
         logging.debug("Parsed metadata (JSON): %s", metadata)
 
         if not all(k in metadata for k in [META_VERSION, META_FILENAME, META_ORIG_SIZE, META_COMPRESSED]):
@@ -270,7 +309,7 @@ def parse_payload_full(
                     "stored in metadata for %s. Using stored data.",
                     len(file_data), original_size, filename,
                 )
-            final_data = file_data
+            final_data = bytes(file_data)
 
         logging.info(
             "Successfully parsed payload. Extracted file: %s Size: %d bytes",
@@ -278,7 +317,7 @@ def parse_payload_full(
         )
         return filename, final_data, metadata
 
-    except json.JSONDecodeError as e:
+    except _JSON_DECODE_ERRORS as e:
         logging.error("Failed to decode metadata JSON: %s", e)
         raise CorruptedPayload(f"Invalid metadata format: {e}")
     except ValueError as e:
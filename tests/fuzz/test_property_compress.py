@@ -0,0 +1,12 @@
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+from stegx.utils import compress_data, decompress_data
+
+@pytest.mark.fuzz
+@settings(max_examples=25, deadline=None)
+@given(st.binary(max_size=65536))
+def test_compress_roundtrip(data):
+    assert decompress_data(compress_data(data)) == data
@@ -1,11 +1,13 @@
 
+import csv
 import os
 import time
 import pytest
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
 import numpy as np
 from PIL import Image
-import matplotlib.pyplot as plt
 
 import argparse
 from stegx import perform_encode as _perform_encode, perform_decode as _perform_decode
@@ -14,6 +16,46 @@ from tests._test_credentials import derive_password
 
 _PERF_PASSWORD = derive_password("perf-regression-suite")
 
+# Generator API is considerably faster than the legacy np.random.randint
+# RandomState path for bulk uint8 draws.
+_RNG = np.random.default_rng()
+
+# One pre-drawn pool instead of a fresh /dev/urandom read per fixture call;
+# nothing here asserts cryptographic randomness of the payload bytes.
+_RANDOM_POOL = _RNG.bytes(1024 * 1024)
+
+def _write_series_report(report_path, header, columns, *, title, xlabel, ylabel):
+    """Write timing series as CSV; importing matplotlib (~300ms) and rendering
+    a figure is deferred behind STEGX_PLOT for local inspection only."""
+    with open(report_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(zip_longest(*columns, fillvalue=""))
+    print(f"Performance report saved to: {report_path}")
+
+    if not os.environ.get("STEGX_PLOT"):
+        return
+    import matplotlib
+
+    # Select the headless backend before pyplot loads; otherwise matplotlib
+    # probes for Tk/Qt, which can take seconds on CI runners.
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    if len(columns) == 2:
+        plt.plot(columns[0], columns[1], marker="o")
+    else:
+        for label, series in zip(header[1:], columns[1:]):
+            plt.plot(columns[0], series, label=label)
+        plt.legend()
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.grid(True)
+    plt.savefig(os.path.splitext(report_path)[0] + ".png", dpi=72, bbox_inches=None)
+    plt.close()
+
 def _enc_args(image_path, file_path, output_path, password, compress=True):
     return argparse.Namespace(
         image=image_path, file=file_path, output=output_path,
@@ -43,89 +85,107 @@ def temp_dir():
     with tempfile.TemporaryDirectory() as tmpdirname:
         yield tmpdirname
 
+@pytest.fixture(scope="session")
+def session_cover_image():
+    # PNG-encoding a 1000x1000 random (incompressible) cover dominates the
+    # fixture cost of several tests here; generate it once per session. The
+    # cover is only ever read, outputs still go to the per-test temp_dir.
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "session_cover_1000x1000.png")
+        arr = _RNG.integers(0, 256, (1000, 1000, 3), dtype=np.uint8)
+        Image.fromarray(arr, "RGB").save(path, compress_level=1)
+        yield path
+
+def _create_payload_file(directory, size_kb):
+    file_path = os.path.join(directory, f"test_file_{size_kb}kb.bin")
+    n = size_kb * 1024
+    reps = -(-n // len(_RANDOM_POOL))
+    data = (_RANDOM_POOL * reps)[:n] if reps > 1 else _RANDOM_POOL[:n]
+    with open(file_path, "wb") as f:
+        f.write(data)
+    return file_path
+
 @pytest.fixture
 def create_test_file():
-
-    def _create_file(directory, size_kb):
-
-        file_path = os.path.join(directory, f"test_file_{size_kb}kb.bin")
-        data = os.urandom(size_kb * 1024)
-        with open(file_path, "wb") as f:
-            f.write(data)
-        return file_path
-
-    return _create_file
+    return _create_payload_file
+
+_STEGO_FILE_SIZES = [10, 50, 100, 200, 500]
+
+@pytest.fixture(scope="session")
+def stego_files(session_cover_image):
+    """Encode each payload size exactly once per session.
+
+    The encode test reports the timings recorded here; the decode test
+    reuses the stego outputs instead of re-running perform_encode.
+    Values are (stego_path_or_None, encode_time_s) keyed by size in KB.
+    """
+    with tempfile.TemporaryDirectory() as d:
+        results = {}
+        for size in _STEGO_FILE_SIZES:
+            file_path = _create_payload_file(d, size)
+            output_path = os.path.join(d, f"stego_output_{size}kb.png")
+            start_time = time.perf_counter()
+            success = perform_encode(
+                session_cover_image, file_path, output_path, _PERF_PASSWORD,
+                compress=True,
+            )
+            elapsed = time.perf_counter() - start_time
+            results[size] = (output_path if success else None, elapsed)
+        yield results
 
 @pytest.fixture
 def create_test_image():
 
-    def _create_image(directory, width, height, mode="RGB"):
+    def _create_image(directory, width, height, mode="RGB", fmt="PNG"):
 
-        file_path = os.path.join(directory, f"test_image_{width}x{height}_{mode}.png")
+        ext = fmt.lower()
+        file_path = os.path.join(directory, f"test_image_{width}x{height}_{mode}.{ext}")
 
         if mode == "RGB":
-            img_array = np.random.randint(0, 256, (height, width, 3), dtype=np.uint8)
-            img = Image.fromarray(img_array, mode)
+            img_array = _RNG.integers(0, 256, (height, width, 3), dtype=np.uint8)
         elif mode == "RGBA":
-            img_array = np.random.randint(0, 256, (height, width, 4), dtype=np.uint8)
-            img = Image.fromarray(img_array, mode)
+            img_array = _RNG.integers(0, 256, (height, width, 4), dtype=np.uint8)
         elif mode == "L":
-            img_array = np.random.randint(0, 256, (height, width), dtype=np.uint8)
-            img = Image.fromarray(img_array, mode)
+            img_array = _RNG.integers(0, 256, (height, width), dtype=np.uint8)
         else:
             raise ValueError(f"Unsupported mode: {mode}")
 
-        img.save(file_path)
+        kwargs = {"compress_level": 1} if fmt == "PNG" else {}
+        Image.fromarray(img_array, mode).save(file_path, format=fmt, **kwargs)
         return file_path
 
     return _create_image
 
 @pytest.mark.performance
-def test_encode_performance_file_size(temp_dir, create_test_file, create_test_image):
+def test_encode_performance_file_size(temp_dir, stego_files):
 
-    global time
-    image_path = create_test_image(temp_dir, 1000, 1000)
-
-    file_sizes = [10, 50, 100, 200, 500]
+    file_sizes = _STEGO_FILE_SIZES
     encode_times = []
 
-    password = _PERF_PASSWORD
-
     for size in file_sizes:
-        file_path = create_test_file(temp_dir, size)
-        output_path = os.path.join(temp_dir, f"stego_output_{size}kb.png")
-
-        start_time = time.time()
-        success = perform_encode(image_path, file_path, output_path, password, compress=True)
-        end_time = time.time()
-
-        if success:
-            encode_time = end_time - start_time
+        stego_path, encode_time = stego_files[size]
+        if stego_path is not None:
             encode_times.append(encode_time)
             print(f"File size: {size} KB, Encode time: {encode_time:.4f} seconds")
         else:
             print(f"Encoding failed for file size: {size} KB")
             encode_times.append(None)
 
-    report_path = os.path.join(temp_dir, "file_size_performance.png")
-
-    valid_sizes = [size for size, time in zip(file_sizes, encode_times) if time is not None]
-    valid_times = [time for time in encode_times if time is not None]
+    valid_sizes = [size for size, t in zip(file_sizes, encode_times) if t is not None]
+    valid_times = [t for t in encode_times if t is not None]
 
     if valid_sizes and valid_times:
-        plt.figure(figsize=(10, 6))
-        plt.plot(valid_sizes, valid_times, marker='o')
-        plt.title('StegX Encoding Performance vs File Size')
-        plt.xlabel('File Size (KB)')
-        plt.ylabel('Encoding Time (seconds)')
-        plt.grid(True)
-        plt.savefig(report_path)
-        print(f"Performance report saved to: {report_path}")
+        _write_series_report(
+            os.path.join(temp_dir, "file_size_performance.csv"),
+            ["file_size_kb", "encode_time_s"], [valid_sizes, valid_times],
+            title="StegX Encoding Performance vs File Size",
+            xlabel="File Size (KB)", ylabel="Encoding Time (seconds)",
+        )
 
 @pytest.mark.performance
+@pytest.mark.slow
 def test_encode_performance_image_size(temp_dir, create_test_file, create_test_image):
 
-    global time
     file_path = create_test_file(temp_dir, 100)
 
     image_sizes = [(500, 500), (1000, 1000), (1500, 1500), (2000, 2000)]
@@ -134,12 +194,15 @@ def test_encode_performance_image_size(temp_dir, create_test_file, create_test_i
     password = _PERF_PASSWORD
 
     for width, height in image_sizes:
-        image_path = create_test_image(temp_dir, width, height)
+        # BMP covers skip PNG-deflating megabytes of random noise, which
+        # otherwise dwarfs the encode being measured; sniff_png_encoder
+        # falls back to default parameters for non-PNG covers.
+        image_path = create_test_image(temp_dir, width, height, fmt="BMP")
         output_path = os.path.join(temp_dir, f"stego_output_{width}x{height}.png")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         success = perform_encode(image_path, file_path, output_path, password, compress=True)
-        end_time = time.time()
+        end_time = time.perf_counter()
 
         if success:
             encode_time = end_time - start_time
@@ -149,25 +212,19 @@ def test_encode_performance_image_size(temp_dir, create_test_file, create_test_i
             print(f"Encoding failed for image size: {width}x{height}")
             encode_times.append(None)
 
-    report_path = os.path.join(temp_dir, "image_size_performance.png")
-
-    valid_sizes = [(w*h)/1_000_000 for (w, h), time in zip(image_sizes, encode_times) if time is not None]
-    valid_times = [time for time in encode_times if time is not None]
+    valid_sizes = [(w*h)/1_000_000 for (w, h), t in zip(image_sizes, encode_times) if t is not None]
+    valid_times = [t for t in encode_times if t is not None]
 
     if valid_sizes and valid_times:
-        plt.figure(figsize=(10, 6))
-        plt.plot(valid_sizes, valid_times, marker='o')
-        plt.title('StegX Encoding Performance vs Image Size')
-        plt.xlabel('Image Size (Megapixels)')
-        plt.ylabel('Encoding Time (seconds)')
-        plt.grid(True)
-        plt.savefig(report_path)
-        print(f"Performance report saved to: {report_path}")
+        _write_series_report(
+            os.path.join(temp_dir, "image_size_performance.csv"),
+            ["image_megapixels", "encode_time_s"], [valid_sizes, valid_times],
+            title="StegX Encoding Performance vs Image Size",
+            xlabel="Image Size (Megapixels)", ylabel="Encoding Time (seconds)",
+        )
 
 @pytest.mark.performance
-def test_decode_performance(temp_dir, create_test_file, create_test_image):
-
-    image_path = create_test_image(temp_dir, 1000, 1000)
+def test_decode_performance(temp_dir, stego_files):
 
     file_sizes = [10, 50, 100, 200]
     decode_times = []
@@ -177,15 +234,12 @@ def test_decode_performance(temp_dir, create_test_file, create_test_image):
     os.makedirs(extract_dir, exist_ok=True)
 
     for size in file_sizes:
-        file_path = create_test_file(temp_dir, size)
-        stego_path = os.path.join(temp_dir, f"stego_output_{size}kb.png")
+        stego_path, _encode_time = stego_files[size]
 
-        success = perform_encode(image_path, file_path, stego_path, password, compress=True)
-
-        if success:
-            start_time = time.time()
+        if stego_path is not None:
+            start_time = time.perf_counter()
             success = perform_decode(stego_path, extract_dir, password)
-            end_time = time.time()
+            end_time = time.perf_counter()
 
             if success:
                 decode_time = end_time - start_time
@@ -198,34 +252,40 @@ def test_decode_performance(temp_dir, create_test_file, create_test_image):
             print(f"Encoding failed for file size: {size} KB, skipping decode test")
             decode_times.append(None)
 
-    report_path = os.path.join(temp_dir, "decode_performance.png")
-
-    valid_sizes = [size for size, time in zip(file_sizes, decode_times) if time is not None]
-    valid_times = [time for time in decode_times if time is not None]
+    valid_sizes = [size for size, t in zip(file_sizes, decode_times) if t is not None]
+    valid_times = [t for t in decode_times if t is not None]
 
     if valid_sizes and valid_times:
-        plt.figure(figsize=(10, 6))
-        plt.plot(valid_sizes, valid_times, marker='o')
-        plt.title('StegX Decoding Performance vs File Size')
-        plt.xlabel('File Size (KB)')
-        plt.ylabel('Decoding Time (seconds)')
-        plt.grid(True)
-        plt.savefig(report_path)
-        print(f"Performance report saved to: {report_path}")
+        _write_series_report(
+            os.path.join(temp_dir, "decode_performance.csv"),
+            ["file_size_kb", "decode_time_s"], [valid_sizes, valid_times],
+            title="StegX Decoding Performance vs File Size",
+            xlabel="File Size (KB)", ylabel="Decoding Time (seconds)",
+        )
+
+def _encode_pair_worker(task):
+    image_path, file_path, out_compressed, out_uncompressed, password = task
+    t0 = time.perf_counter()
+    ok_compressed = perform_encode(image_path, file_path, out_compressed, password, compress=True)
+    t1 = time.perf_counter()
+    ok_uncompressed = perform_encode(image_path, file_path, out_uncompressed, password, compress=False)
+    t2 = time.perf_counter()
+    return ok_compressed, ok_uncompressed, t1 - t0, t2 - t1
 
 @pytest.mark.performance
-def test_compression_effectiveness(temp_dir, create_test_image):
-    image_path = create_test_image(temp_dir, 1000, 1000)
+def test_compression_effectiveness(temp_dir, session_cover_image):
+    image_path = session_cover_image
 
     file_types = {
         "text": "This is a sample text file with repeating content. " * 1000,
-        "binary": os.urandom(100 * 1024),
+        "binary": _RANDOM_POOL[: 100 * 1024],
         "zeros": bytes([0] * 100 * 1024),
     }
 
     results = {}
     password = _PERF_PASSWORD
 
+    tasks = []
     for file_type, content in file_types.items():
         file_path = os.path.join(temp_dir, f"test_{file_type}.bin")
         with open(file_path, "wb") as f:
@@ -233,19 +293,25 @@ def test_compression_effectiveness(temp_dir, create_test_image):
                 f.write(content.encode())
             else:
                 f.write(content)
-
+        tasks.append((
+            image_path,
+            file_path,
+            os.path.join(temp_dir, f"stego_{file_type}_compressed.png"),
+            os.path.join(temp_dir, f"stego_{file_type}_uncompressed.png"),
+            password,
+        ))
+
+    # One worker per file type; the compressed/uncompressed pair stays
+    # inside a single process so the overhead ratio compares timings taken
+    # under the same contention.
+    with ProcessPoolExecutor(max_workers=len(tasks)) as ex:
+        outcomes = list(ex.map(_encode_pair_worker, tasks))
+
+    for (file_type, _content), task, outcome in zip(file_types.items(), tasks, outcomes):
+        _image, file_path, output_path_compressed, output_path_uncompressed, _pw = task
+        success_compressed, success_uncompressed, compressed_time, uncompressed_time = outcome
         original_size = os.path.getsize(file_path)
 
-        output_path_compressed = os.path.join(temp_dir, f"stego_{file_type}_compressed.png")
-        start_time = time.time()
-        success_compressed = perform_encode(image_path, file_path, output_path_compressed, password, compress=True)
-        compressed_time = time.time() - start_time
-
-        output_path_uncompressed = os.path.join(temp_dir, f"stego_{file_type}_uncompressed.png")
-        start_time = time.time()
-        success_uncompressed = perform_encode(image_path, file_path, output_path_uncompressed, password, compress=False)
-        uncompressed_time = time.time() - start_time
-
         if success_compressed and success_uncompressed:
             compressed_size = os.path.getsize(output_path_compressed)
             uncompressed_size = os.path.getsize(output_path_uncompressed)
@@ -291,13 +357,14 @@ def test_compression_effectiveness(temp_dir, create_test_image):
         print(f"Compression report saved to: {report_path}")
 
 @pytest.mark.performance
-def test_memory_usage(temp_dir, create_test_file, create_test_image):
+@pytest.mark.slow
+def test_memory_usage(temp_dir, create_test_file, session_cover_image):
     try:
         import memory_profiler
     except ImportError:
         pytest.skip("memory_profiler package not installed")
 
-    image_path = create_test_image(temp_dir, 1000, 1000)
+    image_path = session_cover_image
     file_path = create_test_file(temp_dir, 100)
     output_path = os.path.join(temp_dir, "stego_memory_test.png")
     extract_dir = os.path.join(temp_dir, "extracted_memory")
@@ -323,18 +390,14 @@ def test_memory_usage(temp_dir, create_test_file, create_test_image):
     print(f"Maximum memory usage during encoding: {encode_max_mem:.2f} MiB")
     print(f"Maximum memory usage during decoding: {decode_max_mem:.2f} MiB")
 
-    report_path = os.path.join(temp_dir, "memory_usage.png")
-
-    plt.figure(figsize=(10, 6))
-    plt.plot(encode_mem_usage, label='Encoding')
-    plt.plot(decode_mem_usage, label='Decoding')
-    plt.title('StegX Memory Usage')
-    plt.xlabel('Time (0.1s intervals)')
-    plt.ylabel('Memory Usage (MiB)')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig(report_path)
-    print(f"Memory usage report saved to: {report_path}")
+    _write_series_report(
+        os.path.join(temp_dir, "memory_usage.csv"),
+        ["sample_index", "encode_mib", "decode_mib"],
+        [list(range(max(len(encode_mem_usage), len(decode_mem_usage)))),
+         encode_mem_usage, decode_mem_usage],
+        title="StegX Memory Usage",
+        xlabel="Time (0.1s intervals)", ylabel="Memory Usage (MiB)",
+    )
 
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
@@ -25,7 +25,7 @@ def cover(temp_dir):
         rng = np.random.default_rng(seed=7)
         arr = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
         p = os.path.join(temp_dir, f"cover_{size}.png")
-        Image.fromarray(arr, "RGB").save(p)
+        Image.fromarray(arr, "RGB").save(p, compress_level=1)
         return p
 
     return _make
@@ -63,16 +63,88 @@ def test_stego_changes_are_low_rate(temp_dir, cover):
     payload = b"short"
     embed_v2(cover_path, payload, stego_path, TEST_PASSWORD, EmbedOptions(max_fill_ratio=1.0))
 
-    cover_arr = np.array(Image.open(cover_path))
-    stego_arr = np.array(Image.open(stego_path))
-    diff = np.abs(cover_arr.astype(int) - stego_arr.astype(int))
+    cover_arr = np.asarray(Image.open(cover_path))
+    stego_arr = np.asarray(Image.open(stego_path))
 
-    assert diff.max() <= 1
+    assert np.abs(cover_arr.astype(np.int16) - stego_arr).max() <= 1
 
-    changed = (diff != 0).sum()
+    # Every +-1 change flips the value's parity, so one fused XOR+mask pass
+    # counts changed bytes without materializing per-plane LSB arrays.
+    changed = int(np.count_nonzero((cover_arr ^ stego_arr) & 1))
     total = cover_arr.size
     assert changed / total < 0.15
 
+@pytest.mark.security
+def test_tampered_stego_region_is_rejected(temp_dir, cover):
+    stego = os.path.join(temp_dir, "stego_t.png")
+    embed_v2(cover(), b"payload", stego, TEST_PASSWORD, EmbedOptions(max_fill_ratio=1.0))
+
+    with Image.open(stego) as img:
+        arr = np.array(img)
+    arr[:, : arr.shape[1] // 5] = (255, 0, 0)
+    tampered = os.path.join(temp_dir, "tampered.png")
+    Image.fromarray(arr, "RGB").save(tampered)
+
+    with pytest.raises(ValueError):
+        extract_v2(tampered, TEST_PASSWORD)
+
+def _chi_square_pairs(channel: np.ndarray) -> float:
+    counts = np.bincount(channel.ravel(), minlength=256).astype(float)
+    even, odd = counts[0::2], counts[1::2]
+    expected = (even + odd) / 2.0
+    mask = expected > 0
+    return float(
+        (((even - expected) ** 2 + (odd - expected) ** 2)[mask] / expected[mask]).sum()
+    )
+
+@pytest.mark.security
+def test_chi_square_pair_statistic_barely_moves(temp_dir, cover):
+    cover_path = cover(300)
+    stego_path = os.path.join(temp_dir, "stego_chi.png")
+    embed_v2(
+        cover_path, b"short payload", stego_path, TEST_PASSWORD,
+        EmbedOptions(max_fill_ratio=1.0),
+    )
+
+    cover_arr = np.asarray(Image.open(cover_path))
+    stego_arr = np.asarray(Image.open(stego_path))
+
+    # A saturating LSB-replacement embed drags even/odd pair counts toward
+    # equality; a small keyed payload must leave the statistic essentially
+    # where the cover put it, per channel.
+    for ch in range(3):
+        chi_cover = _chi_square_pairs(cover_arr[..., ch])
+        chi_stego = _chi_square_pairs(stego_arr[..., ch])
+        assert abs(chi_stego - chi_cover) < 0.25 * chi_cover
+
+@pytest.mark.security
+def test_histogram_correlation_stays_high(temp_dir, cover):
+    cover_path = cover(300)
+    stego_path = os.path.join(temp_dir, "stego_hist.png")
+    embed_v2(
+        cover_path, b"short payload", stego_path, TEST_PASSWORD,
+        EmbedOptions(max_fill_ratio=1.0),
+    )
+
+    cover_arr = np.asarray(Image.open(cover_path))
+    stego_arr = np.asarray(Image.open(stego_path))
+
+    cover_hists = np.stack(
+        [np.bincount(cover_arr[..., ch].ravel(), minlength=256) for ch in range(3)]
+    ).astype(float)
+    stego_hists = np.stack(
+        [np.bincount(stego_arr[..., ch].ravel(), minlength=256) for ch in range(3)]
+    ).astype(float)
+
+    # Pearson correlation on the stacked (C, 256) matrices in one pass
+    # instead of np.corrcoef per channel.
+    cd = cover_hists - cover_hists.mean(axis=1, keepdims=True)
+    sd = stego_hists - stego_hists.mean(axis=1, keepdims=True)
+    corr = (cd * sd).sum(axis=1) / np.sqrt(
+        (cd * cd).sum(axis=1) * (sd * sd).sum(axis=1)
+    )
+    assert corr.min() >= 0.96
+
 @pytest.mark.security
 def test_output_has_no_pillow_software_chunk(temp_dir, cover):
     stego = os.path.join(temp_dir, "out.png")
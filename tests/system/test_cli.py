@@ -1,19 +1,28 @@
+import hashlib
+import io
 import os
 import subprocess
 import sys
 import tempfile
+from types import SimpleNamespace
 
 import numpy as np
 import pytest
 from PIL import Image
 
+from stegx.cli import main as stegx_main
+
 TEST_PASSWORD = "cli-system-test-passphrase-77"
+
+# tmpfs keeps test PNG/payload I/O in RAM on Linux; elsewhere fall back to
+# the platform default temp location.
+_TMP_BASE = "/dev/shm" if os.path.isdir("/dev/shm") else None
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 
 SRC_DIR = os.path.join(PROJECT_ROOT, "src")
 
-def _run(args, stdin_text=None):
+def _run_subprocess(args, stdin_text=None):
     env = os.environ.copy()
     env["PYTHONPATH"] = SRC_DIR + os.pathsep + env.get("PYTHONPATH", "")
     return subprocess.run(
@@ -25,38 +34,87 @@ def _run(args, stdin_text=None):
         timeout=180,
     )
 
+def _files_equal(a, b, chunk_size=1 << 16):
+    """Chunked blake2b comparison so large extracted payloads never need
+    both copies resident in memory at once."""
+    digests = []
+    for path in (a, b):
+        h = hashlib.blake2b()
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                h.update(chunk)
+        digests.append(h.digest())
+    return digests[0] == digests[1]
+
+@pytest.fixture
+def run_cli(monkeypatch, capsys):
+    """Invoke the CLI in-process, skipping a fresh interpreter plus the
+    PIL/NumPy/cryptography import cost per invocation. One subprocess smoke
+    test below still covers the real ``python -m stegx`` path."""
+
+    def _run(args, stdin_text=None):
+        if stdin_text is not None:
+            monkeypatch.setattr("sys.stdin", io.StringIO(stdin_text))
+        try:
+            stegx_main(list(args))
+            rc = 0
+        except SystemExit as e:
+            if e.code is None:
+                rc = 0
+            elif isinstance(e.code, int):
+                rc = e.code
+            else:
+                rc = 1
+        out, err = capsys.readouterr()
+        return SimpleNamespace(returncode=rc, stdout=out, stderr=err)
+
+    return _run
+
 @pytest.fixture
 def temp_dir():
-    with tempfile.TemporaryDirectory() as t:
+    with tempfile.TemporaryDirectory(dir=_TMP_BASE) as t:
         yield t
 
-@pytest.fixture
-def sample_payload(temp_dir):
-    p = os.path.join(temp_dir, "payload.bin")
+# The payload and cover are only ever read by the CLI under test, so they
+# live in a session-scoped directory; each subprocess already dominates a
+# test's cost without re-encoding the same PNG per test on top.
+@pytest.fixture(scope="session")
+def _input_dir():
+    with tempfile.TemporaryDirectory(dir=_TMP_BASE) as t:
+        yield t
+
+@pytest.fixture(scope="session")
+def sample_payload(_input_dir):
+    p = os.path.join(_input_dir, "payload.bin")
     with open(p, "wb") as f:
         f.write(b"CLI system-test payload \x00\x01\x02\x03" * 4)
     return p
 
-@pytest.fixture
-def cover_image(temp_dir):
+@pytest.fixture(scope="session")
+def cover_image(_input_dir):
     rng = np.random.default_rng(seed=11)
     arr = rng.integers(0, 256, (200, 200, 3), dtype=np.uint8)
-    p = os.path.join(temp_dir, "cover.png")
-    Image.fromarray(arr, "RGB").save(p)
+    p = os.path.join(_input_dir, "cover.png")
+    Image.fromarray(arr, "RGB").save(p, compress_level=1)
     return p
 
-def test_help_runs():
-    r = _run(["--help"])
+def test_help_runs(run_cli):
+    r = run_cli(["--help"])
     assert r.returncode == 0
     assert "StegX" in r.stdout
 
-def test_version_runs():
-    r = _run(["--version"])
+def test_version_runs(run_cli):
+    r = run_cli(["--version"])
     assert r.returncode == 0
 
-def test_encode_decode_with_stdin_password(temp_dir, cover_image, sample_payload):
+def test_module_subprocess_smoke():
+    r = _run_subprocess(["--version"])
+    assert r.returncode == 0
+    assert "stegx" in r.stdout
+
+def test_encode_decode_with_stdin_password(run_cli, temp_dir, cover_image, sample_payload):
     stego = os.path.join(temp_dir, "stego.png")
-    r_enc = _run(
+    r_enc = run_cli(
         [
             "encode",
             "-i", cover_image,
@@ -70,7 +128,7 @@ def test_encode_decode_with_stdin_password(temp_dir, cover_image, sample_payload
     assert os.path.isfile(stego)
 
     out_dir = os.path.join(temp_dir, "extracted")
-    r_dec = _run(
+    r_dec = run_cli(
         [
             "decode",
             "-i", stego,
@@ -80,42 +138,42 @@ def test_encode_decode_with_stdin_password(temp_dir, cover_image, sample_payload
         stdin_text=TEST_PASSWORD + "\n",
     )
     assert r_dec.returncode == 0, r_dec.stderr
-    with open(os.path.join(out_dir, os.path.basename(sample_payload)), "rb") as f:
-        with open(sample_payload, "rb") as orig:
-            assert f.read() == orig.read()
+    assert _files_equal(
+        os.path.join(out_dir, os.path.basename(sample_payload)), sample_payload
+    )
 
-def test_wrong_password_exit_code(temp_dir, cover_image, sample_payload):
+def test_wrong_password_exit_code(run_cli, temp_dir, cover_image, sample_payload):
     stego = os.path.join(temp_dir, "stego.png")
-    _run(
+    run_cli(
         ["encode", "-i", cover_image, "-f", sample_payload, "-o", stego, "--password-stdin"],
         stdin_text=TEST_PASSWORD + "\n",
     )
     out_dir = os.path.join(temp_dir, "out")
-    r = _run(
+    r = run_cli(
         ["decode", "-i", stego, "-d", out_dir, "--password-stdin"],
         stdin_text="wrong-password\n",
     )
     assert r.returncode != 0
 
-def test_missing_subcommand_shows_error():
-    r = _run([])
+def test_missing_subcommand_shows_error(run_cli):
+    r = run_cli([])
     assert r.returncode != 0
 
-def test_benchmark_subcommand_runs():
-    r = _run(["benchmark", "--iterations", "1", "--size-kib", "4"])
+def test_benchmark_subcommand_runs(run_cli):
+    r = run_cli(["benchmark", "--iterations", "1", "--size-kib", "4"])
     assert r.returncode == 0, r.stderr
     assert "Argon2id KDF timing" in r.stdout
     assert "Compression multiplexer" in r.stdout
 
-def test_version_shows_extras_status():
-    r = _run(["--version"])
+def test_version_shows_extras_status(run_cli):
+    r = run_cli(["--version"])
     assert r.returncode == 0
     assert "stegx" in r.stdout
     assert "argon2-cffi" in r.stdout
     assert "ykman (YubiKey)" in r.stdout
 
-def test_benchmark_calibrate_runs():
-    r = _run(["benchmark", "--calibrate", "--target-ms", "200"])
+def test_benchmark_calibrate_runs(run_cli):
+    r = run_cli(["benchmark", "--calibrate", "--target-ms", "200"])
     assert r.returncode == 0, r.stderr
     assert "Recommended Argon2id params" in r.stdout
 
@@ -156,6 +214,6 @@ def test_installed_binary_roundtrip(temp_dir, cover_image, sample_payload):
         capture_output=True, text=True, timeout=180,
     )
     assert r_dec.returncode == 0, r_dec.stderr
-    with open(os.path.join(out_dir, os.path.basename(sample_payload)), "rb") as f:
-        with open(sample_payload, "rb") as orig:
-            assert f.read() == orig.read()
+    assert _files_equal(
+        os.path.join(out_dir, os.path.basename(sample_payload)), sample_payload
+    )
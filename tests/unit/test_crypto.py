@@ -11,48 +11,51 @@ from stegx.crypto import (
 from stegx.header import FLAG_DUAL_CIPHER, FLAG_KEYFILE, Header
 from stegx.kdf import KdfParams
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_data():
     return b"StegX v2 test data for encryption/decryption 1234567890!@#$%^&*()"
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_password():
     return "StegXTestPassword123!@#"
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def default_options():
     return EncryptOptions(kdf_params=KdfParams.default_argon2id())
 
-def test_encrypt_emits_valid_header(sample_data, sample_password, default_options):
-    stream = encrypt_data(sample_data, sample_password, default_options)
-    header = Header.unpack(stream)
-    assert len(stream) > header.packed_size
+@pytest.fixture(scope="module")
+def default_stream(sample_data, sample_password, default_options):
+    # Argon2id dominates every encrypt_data call; tests that do not assert
+    # salt/nonce freshness share this one stream (and copy before mutating).
+    return encrypt_data(sample_data, sample_password, default_options)
+
+def test_encrypt_emits_valid_header(default_stream, default_options):
+    header = Header.unpack(default_stream)
+    assert len(default_stream) > header.packed_size
     assert header.kdf.kdf_id == default_options.kdf_params.kdf_id
-    assert header.inner_ct_length == len(stream) - header.packed_size
+    assert header.inner_ct_length == len(default_stream) - header.packed_size
 
-def test_roundtrip_argon2id(sample_data, sample_password, default_options):
-    stream = encrypt_data(sample_data, sample_password, default_options)
-    assert decrypt_data(stream, sample_password) == sample_data
+def test_roundtrip_argon2id(default_stream, sample_data, sample_password):
+    assert decrypt_data(default_stream, sample_password) == sample_data
 
 def test_roundtrip_pbkdf2(sample_data, sample_password):
     opts = EncryptOptions(kdf_params=KdfParams(kdf_id=0x01, iterations=100_000))
     stream = encrypt_data(sample_data, sample_password, opts)
     assert decrypt_data(stream, sample_password) == sample_data
 
-def test_wrong_password_fails(sample_data, sample_password, default_options):
-    stream = encrypt_data(sample_data, sample_password, default_options)
+def test_wrong_password_fails(default_stream, sample_password):
     with pytest.raises(InvalidTag):
-        decrypt_data(stream, sample_password + "x")
+        decrypt_data(default_stream, sample_password + "x")
 
-def test_corrupted_ciphertext_fails(sample_data, sample_password, default_options):
-    stream = bytearray(encrypt_data(sample_data, sample_password, default_options))
+def test_corrupted_ciphertext_fails(default_stream, sample_password):
+    stream = bytearray(default_stream)
     header = Header.unpack(bytes(stream))
     stream[header.packed_size] ^= 0x01
     with pytest.raises(InvalidTag):
         decrypt_data(bytes(stream), sample_password)
 
-def test_corrupted_header_aad_fails(sample_data, sample_password, default_options):
-    stream = bytearray(encrypt_data(sample_data, sample_password, default_options))
+def test_corrupted_header_aad_fails(default_stream, sample_password):
+    stream = bytearray(default_stream)
     stream[3] ^= 0x80
     with pytest.raises((InvalidTag, ValueError)):
         decrypt_data(bytes(stream), sample_password)
@@ -24,7 +24,7 @@ from stegx.header import (
     VERSION_V3,
     Header,
 )
-from stegx.kdf import KDF_ARGON2ID, KDF_PBKDF2, KdfParams
+from stegx.kdf import KDF_ARGON2ID, KDF_PBKDF2, KDF_PBKDF2_SHA512, KdfParams
 
 def _argon_header(flags=0, inner_len=1024):
     return Header(
@@ -63,7 +63,7 @@ def test_pack_unpack_roundtrip_pbkdf2():
         inner_ct_length=42,
     )
     parsed = Header.unpack(h.pack())
-    assert parsed.kdf.kdf_id == KDF_PBKDF2
+    assert parsed.kdf.kdf_id == KDF_PBKDF2_SHA512
     assert parsed.kdf.iterations == h.kdf.iterations
     assert parsed.has(FLAG_DUAL_CIPHER)
     assert parsed.has(FLAG_KEYFILE)
@@ -236,7 +236,7 @@ def test_v3_pack_rejects_bad_yk_nonce_size():
 def test_v3_pbkdf2_kdf_params_roundtrip():
     h = _v3_header(kdf_params=KdfParams.default_pbkdf2(), kms_wrap=b"wrap-me")
     parsed = Header.unpack(h.pack())
-    assert parsed.kdf.kdf_id == KDF_PBKDF2
+    assert parsed.kdf.kdf_id == KDF_PBKDF2_SHA512
     assert parsed.kdf.iterations == h.kdf.iterations
     assert parsed.kms_wrap == b"wrap-me"
 
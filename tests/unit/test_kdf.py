@@ -8,6 +8,7 @@ from stegx.kdf import (
     HKDF_INFO_SENTINEL,
     KDF_ARGON2ID,
     KDF_PBKDF2,
+    KDF_PBKDF2_SHA512,
     KdfParams,
     derive_legacy_seed_from_password,
     derive_master_key,
@@ -40,6 +41,16 @@ def test_pbkdf2_master_key():
     salt = b"\x33" * 16
     assert derive_master_key("pw", salt, params) == derive_master_key("pw", salt, params)
 
+def test_pbkdf2_sha512_is_distinct_from_sha256():
+    salt = b"\x33" * 16
+    sha256 = derive_master_key("pw", salt, KdfParams(kdf_id=KDF_PBKDF2, iterations=1000))
+    sha512 = derive_master_key("pw", salt, KdfParams(kdf_id=KDF_PBKDF2_SHA512, iterations=1000))
+    assert sha256 != sha512
+    assert len(sha512) == 32
+
+def test_default_pbkdf2_uses_sha512():
+    assert KdfParams.default_pbkdf2().kdf_id == KDF_PBKDF2_SHA512
+
 def test_hkdf_domain_separation():
     master = b"\x42" * 32
     aes = hkdf_subkey(master, HKDF_INFO_AES)
@@ -16,19 +16,36 @@ from stegx.steganography import (
 
 TEST_PASSWORD = "sufficiently-long-test-passphrase-42"
 
-@pytest.fixture
+# tmpfs keeps cover/stego I/O in RAM on Linux; elsewhere fall back to the
+# platform default temp location.
+_TMP_BASE = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Module scope: covers are deterministic (fixed seed and per-shape
+# filenames) and every stego output below uses a unique basename, so tests
+# can share one directory and skip a TemporaryDirectory per test.
+@pytest.fixture(scope="module")
 def temp_dir():
-    with tempfile.TemporaryDirectory() as t:
+    with tempfile.TemporaryDirectory(dir=_TMP_BASE) as t:
         yield t
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_data():
     return b"StegX v2 steganography test data 1234567890!@#$%^&*()"
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def create_test_image(temp_dir):
     def _create(width, height, mode="RGB", filename=None):
-        filepath = os.path.join(temp_dir, filename or f"test_{mode}_{width}x{height}.png")
+        # Random noise is DEFLATE's worst case, so covers are saved as BMP
+        # to skip the zlib pass. RGBA and P stay PNG: PIL cannot write RGBA
+        # BMPs, and its palette BMPs round-trip unreliably. Stego outputs
+        # are still PNG via embed_v2 itself.
+        ext = "bmp" if mode in ("RGB", "L") else "png"
+        filepath = os.path.join(temp_dir, filename or f"test_{mode}_{width}x{height}.{ext}")
+        # Covers are a pure function of (mode, size) thanks to the fixed
+        # seed, so a file already written for this shape can be reused
+        # without re-drawing and re-encoding it.
+        if os.path.exists(filepath):
+            return filepath
         rng = np.random.default_rng(seed=42)
         if mode == "RGB":
             arr = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
@@ -37,15 +54,16 @@ def create_test_image(temp_dir):
         elif mode == "L":
             arr = rng.integers(0, 256, (height, width), dtype=np.uint8)
         elif mode == "P":
-            img = Image.new("P", (width, height), color=0)
-            for y in range(height):
-                for x in range(width):
-                    img.putpixel((x, y), (x + y) % 256)
-            img.save(filepath)
+            # Same (x + y) % 256 gradient as the old putpixel loop, built in
+            # one broadcast instead of width*height Python-level PIL calls.
+            idx = (np.add.outer(np.arange(height), np.arange(width)) & 0xFF).astype(np.uint8)
+            Image.fromarray(idx, mode="P").save(filepath, compress_level=1)
             return filepath
         else:
             raise ValueError(f"Unsupported mode: {mode}")
-        Image.fromarray(arr, mode).save(filepath)
+        # Fixture PNGs are throwaway: zlib level 1 encodes random noise
+        # several times faster than the level-6 default.
+        Image.fromarray(arr, mode).save(filepath, compress_level=1)
         return filepath
 
     return _create
@@ -79,6 +97,17 @@ def test_embed_and_extract_rgb(create_test_image, sample_data, temp_dir):
     assert os.path.exists(stego)
     assert extract_v2(stego, TEST_PASSWORD) == sample_data
 
+def test_embed_and_extract_rgba_preserves_alpha(create_test_image, sample_data, temp_dir):
+    cover = create_test_image(200, 200, "RGBA")
+    stego = os.path.join(temp_dir, "stego_rgba.png")
+    embed_v2(cover, sample_data, stego, TEST_PASSWORD, EmbedOptions(max_fill_ratio=1.0))
+    assert extract_v2(stego, TEST_PASSWORD) == sample_data
+
+    with Image.open(cover) as before, Image.open(stego) as after:
+        cover_alpha = np.asarray(before)[..., 3]
+        stego_alpha = np.asarray(after)[..., 3]
+    assert np.array_equal(cover_alpha, stego_alpha)
+
 def test_embed_and_extract_grayscale(create_test_image, sample_data, temp_dir):
     cover = create_test_image(300, 300, "L")
     stego = os.path.join(temp_dir, "stego_gray.png")
@@ -101,7 +130,7 @@ def test_capacity_exceeded_raises(create_test_image, temp_dir):
 
 def test_max_fill_ratio_enforced(create_test_image, temp_dir):
     cover = create_test_image(80, 80, "RGB")
-    stego = os.path.join(temp_dir, "stego.png")
+    stego = os.path.join(temp_dir, "stego_maxfill.png")
     with pytest.raises(ValueError):
         embed_v2(cover, b"A" * 600, stego, TEST_PASSWORD, EmbedOptions(max_fill_ratio=0.10))
 
@@ -74,6 +74,10 @@ def test_compress_decompress_data(sample_data):
 
     assert decompressed == sample_data
 
+def test_compressible_data_shrinks():
+    data = b"a" * 1000
+    assert len(compress_data(data)) < len(data)
+
 def test_decompress_invalid_data():
     invalid_data = b"This is not valid compressed data"
 
@@ -221,7 +225,9 @@ def test_save_extracted_file_io_error(temp_dir, monkeypatch):
     def mock_open(*args, **kwargs):
         raise IOError("Simulated IO error")
 
-    monkeypatch.setattr("builtins.open", mock_open)
+    # Patch the module's open reference, not builtins.open: pytest itself
+    # (and parallel xdist workers) still need the real open during this test.
+    monkeypatch.setattr("stegx.utils.open", mock_open, raising=False)
 
 
     with pytest.raises(IOError):